@@ -1,6 +1,15 @@
 from django.contrib import admin
 from .models import Character, CharactersConfig
+from .signals import combat_stats_changed
+
+
+@admin.register(Character)
+class CharacterAdmin(admin.ModelAdmin):
+    def save_model(self, request, obj, form, change):
+        # atributos/equipamentos podem ter sido editados aqui
+        obj.refresh_combat_stats()
+        super().save_model(request, obj, form, change)
+        combat_stats_changed.send(sender=Character, instance=obj)
 
 
-admin.site.register(Character)
 admin.site.register(CharactersConfig)
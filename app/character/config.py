@@ -0,0 +1,54 @@
+# character/config.py
+"""
+Cache por processo das configurações "singleton" do jogo (``CharactersConfig``,
+``TasksConfig``), lidas em caminhos quentes como ganho de XP, treino e
+descanso.
+
+A linha é carregada do banco uma vez e reaproveitada por até ``ttl`` segundos.
+Salvar/apagar a configuração invalida o cache do processo atual na hora
+(``post_save``/``post_delete``); nos outros processos vale o TTL.
+"""
+import time
+
+from django.db.models.signals import post_save, post_delete
+
+from .models import CharactersConfig
+
+CONFIG_TTL = 60  # segundos
+
+
+class ConfigCache:
+    def __init__(self, model, ttl=CONFIG_TTL):
+        self.model = model
+        self.ttl = ttl
+        self._value = None
+        self._loaded_at = None
+        self._generation = 0
+
+        post_save.connect(self._changed, sender=model, weak=False)
+        post_delete.connect(self._changed, sender=model, weak=False)
+
+    def get(self):
+        """A configuração atual (ou ``None`` se não houver nenhuma no banco)."""
+        loaded_at = self._loaded_at
+        if loaded_at is not None and time.monotonic() - loaded_at < self.ttl:
+            return self._value
+
+        generation = self._generation
+        value = self.model.objects.first()
+        # se a config mudou durante a consulta, não guarda o valor possivelmente velho
+        if generation == self._generation:
+            self._value = value
+            self._loaded_at = time.monotonic()
+        return value
+
+    def invalidate(self):
+        self._generation += 1
+        self._loaded_at = None
+        self._value = None
+
+    def _changed(self, sender, **kwargs):
+        self.invalidate()
+
+
+characters_config = ConfigCache(CharactersConfig)
@@ -1,3 +1,12 @@
+EQUIPMENT_SLOTS = (
+    "equipped_head",
+    "equipped_necklace",
+    "equipped_shoulders",
+    "equipped_chest",
+    "equipped_hands",
+    "equipped_feet",
+)
+
 SLOT_WEAKNESS_MULTIPLIER = {
     "equipped_head": 0.10,
     "equipped_hands": 0.00,
@@ -5,4 +14,7 @@ SLOT_WEAKNESS_MULTIPLIER = {
     "equipped_shoulders": 0.10,
     "equipped_chest": 0.15,
     "equipped_necklace": 0.00, 
-}
\ No newline at end of file
+}
+
+# estilos de ataque que podem explorar a fraqueza de um equipamento
+ATTACK_STYLES = ("slash", "pierce", "blunt")
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:03
+
+from django.db import migrations, models
+
+from character.constants import ATTACK_STYLES, SLOT_WEAKNESS_MULTIPLIER
+
+
+def fill_weakness_vector(apps, schema_editor):
+    Character = apps.get_model("character", "Character")
+    slots = [slot for slot, extra in SLOT_WEAKNESS_MULTIPLIER.items() if extra]
+
+    characters = Character.objects.select_related(*slots)
+    for character in characters.iterator(chunk_size=500):
+        vector = dict.fromkeys(ATTACK_STYLES, 0.0)
+        for slot in slots:
+            equip = getattr(character, slot)
+            weakness = (
+                ((equip.stats or {}).get("defense") or {}).get("weakness")
+                if equip
+                else None
+            )
+            if isinstance(weakness, str):
+                vector[weakness] = round(
+                    vector.get(weakness, 0.0) + SLOT_WEAKNESS_MULTIPLIER[slot], 4
+                )
+        character.weakness_vector = vector
+        character.save(update_fields=["weakness_vector"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("character", "0011_delete_monster"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="character",
+            name="weakness_vector",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.RunPython(fill_weakness_vector, migrations.RunPython.noop),
+    ]
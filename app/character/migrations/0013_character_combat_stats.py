@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("character", "0012_character_weakness_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="character",
+            name="combat_stats",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
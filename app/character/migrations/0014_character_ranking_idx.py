@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("character", "0013_character_combat_stats"),
+        ("items", "0009_alter_item_recipe"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="character",
+            index=models.Index(
+                fields=["type", "-level", "-exp", "id"], name="character_ranking_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,54 @@
+from django.db import migrations
+
+from character.constants import EQUIPMENT_SLOTS
+
+BASE_ATTRIBUTES = ("strength", "dexterity", "arcane", "constitution", "courage", "luck")
+
+
+# cópia das fórmulas de character.models.secondary_attributes de quando esta
+# migração foi escrita: a migração não pode mudar se o modelo mudar
+def secondary_attributes(final):
+    return {
+        "physical_damage": final["strength"] + final["courage"] * 0.1,
+        "magical_damage": final["arcane"] + final["courage"] * 0.1,
+        "accuracy": final["dexterity"] + final["courage"] * 0.1,
+        "crit_chance": min(final["luck"] * 0.5, 50),
+        "crit_damage": round(
+            1
+            + final["dexterity"] * 0.1
+            + final["courage"] * 0.01
+            + final["arcane"] * 0.01,
+            2,
+        ),
+        "total_hp": final["constitution"] * 10,
+        "total_mana": final["arcane"] * 10,
+    }
+
+
+def fill_combat_stats(apps, schema_editor):
+    Character = apps.get_model("character", "Character")
+
+    characters = Character.objects.select_related(*EQUIPMENT_SLOTS)
+    for character in characters.iterator(chunk_size=500):
+        attrs = {attr: getattr(character, attr) for attr in BASE_ATTRIBUTES}
+        for slot in EQUIPMENT_SLOTS:
+            equip = getattr(character, slot)
+            if equip:
+                for attr, val in (equip.attribute_bonuses or {}).items():
+                    attrs[attr] = attrs.get(attr, 0) + val
+        character.combat_stats = {
+            "attrs": attrs,
+            "secondary": secondary_attributes(attrs),
+        }
+        character.save(update_fields=["combat_stats"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("character", "0014_character_ranking_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_combat_stats, migrations.RunPython.noop),
+    ]
@@ -2,7 +2,38 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 
-from .constants import SLOT_WEAKNESS_MULTIPLIER
+from .constants import ATTACK_STYLES, EQUIPMENT_SLOTS, SLOT_WEAKNESS_MULTIPLIER
+from .progression import level_up
+
+def secondary_attributes(final):
+    """Atributos secundários exibidos no perfil, a partir dos atributos finais."""
+    return {
+        "physical_damage": final["strength"] + final["courage"] * 0.1,
+        "magical_damage": final["arcane"] + final["courage"] * 0.1,
+        "accuracy": final["dexterity"] + final["courage"] * 0.1,
+        "crit_chance": min(final["luck"] * 0.5, 50),
+        "crit_damage": round(
+            1 + final["dexterity"] * 0.1 + final["courage"] * 0.01 + final["arcane"] * 0.01, 2
+        ),
+        "total_hp": final["constitution"] * 10,
+        "total_mana": final["arcane"] * 10,
+    }
+
+
+def loadout_related(prefix=""):
+    """
+    Caminhos de ``select_related`` para os seis slots de equipamento e seus
+    ``Item``. ``prefix`` é a relação até o ``Character`` (ex: "monster").
+    """
+    prefix = f"{prefix}__" if prefix else ""
+    return tuple(f"{prefix}{slot}__item" for slot in EQUIPMENT_SLOTS)
+
+
+class CharacterQuerySet(models.QuerySet):
+    def with_loadout(self):
+        """Traz os equipamentos de todos os slots (e seus Items) no mesmo SELECT."""
+        return self.select_related(*loadout_related())
+
 
 class CharactersConfig(models.Model):
     # Progressão de nível
@@ -10,6 +41,8 @@ class CharactersConfig(models.Model):
 
 class Character(models.Model):
 
+    objects = CharacterQuerySet.as_manager()
+
     CHARACTER_TYPES = [
         ("player", "Player"),
         ("npc", "NPC"),
@@ -73,14 +106,31 @@ class Character(models.Model):
         'items.Equipment', null=True, blank=True, on_delete=models.SET_NULL, related_name='+'
     )
 
-    def get_total_weakness(self, style: str) -> float:
+    # multiplicador de fraqueza por estilo de ataque, somando todos os equipamentos.
+    # Desnormalizado: recalculado só quando os equipamentos mudam (refresh_weakness_vector).
+    weakness_vector = models.JSONField(default=dict, blank=True)
+    # atributos finais (base + equipamentos) e secundários, no formato
+    # {"attrs": {...}, "secondary": {...}}. Desnormalizado: recalculado só ao trocar
+    # equipamento ou gastar ponto de atributo (refresh_combat_stats).
+    combat_stats = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        indexes = [
+            # ranking de jogadores paginado por cursor, ver character/ranking.py
+            models.Index(fields=["type", "-level", "-exp", "id"], name="character_ranking_idx"),
+        ]
+
+    def compute_weakness_vector(self) -> dict:
         """
-        Retorna o multiplicador total de fraqueza do personagem contra
-        um tipo de ataque (style), somando todos os equipamentos.
+        Calcula, numa única passada pelos slots, o multiplicador de fraqueza
+        contra cada estilo de ataque (ATTACK_STYLES).
         """
-        total_multiplier = 0.0
+        vector = dict.fromkeys(ATTACK_STYLES, 0.0)
 
         for slot, extra in SLOT_WEAKNESS_MULTIPLIER.items():
+            if not extra:
+                continue
+
             equip = getattr(self, slot)
 
             if not equip:
@@ -88,10 +138,22 @@ class Character(models.Model):
 
             weakness = equip.parsed_stats.defense.weakness
 
-            if weakness == style:
-                total_multiplier += extra
+            if isinstance(weakness, str):
+                vector[weakness] = round(vector.get(weakness, 0.0) + extra, 4)
+
+        return vector
+
+    def refresh_weakness_vector(self):
+        """Recalcula ``weakness_vector`` (sem salvar). Chamar ao trocar equipamento."""
+        self.weakness_vector = self.compute_weakness_vector()
+        return self.weakness_vector
 
-        return total_multiplier
+    def get_total_weakness(self, style: str) -> float:
+        """
+        Retorna o multiplicador total de fraqueza do personagem contra
+        um tipo de ataque (style), lido do vetor já calculado.
+        """
+        return self.weakness_vector.get(style, 0.0)
 
     def total_attributes(self):
         """
@@ -107,19 +169,39 @@ class Character(models.Model):
         }
 
         # Somar todos atributos dos equips
-        equipped_items = [
-            self.equipped_head, self.equipped_necklace, self.equipped_shoulders,
-            self.equipped_chest, self.equipped_hands, self.equipped_feet,
-        ]
+        equipped_items = [getattr(self, slot) for slot in EQUIPMENT_SLOTS]
         for eq in filter(None, equipped_items):
             for attr, val in (eq.attribute_bonuses or {}).items():
                 attrs[attr] = attrs.get(attr, 0) + val
 
         return attrs
-    
+
+    def compute_combat_stats(self) -> dict:
+        final = self.total_attributes()
+        return {"attrs": final, "secondary": secondary_attributes(final)}
+
+    def refresh_combat_stats(self):
+        """
+        Recalcula ``combat_stats`` e ``weakness_vector`` (sem salvar). Chamar
+        sempre que equipamentos ou atributos base mudarem.
+        """
+        self.combat_stats = self.compute_combat_stats()
+        self.refresh_weakness_vector()
+        return self.combat_stats
+
+    # campos gravados por refresh_combat_stats
+    COMBAT_STATS_FIELDS = ("combat_stats", "weakness_vector")
+
+    def _stored_combat_stats(self):
+        # personagens que ainda não passaram por refresh_combat_stats (recém-criados,
+        # monstros) calculam na hora; o resultado fica só em memória
+        if not self.combat_stats:
+            self.combat_stats = self.compute_combat_stats()
+        return self.combat_stats
+
     @property
     def final_attr(self):
-        return self.total_attributes()
+        return dict(self._stored_combat_stats()["attrs"])
 
     def __str__(self):
         return f"{self.name} (lvl {self.level})"
@@ -127,67 +209,59 @@ class Character(models.Model):
     def is_idle(self):
         return self.training_start is None and self.resting_start is None
 
-    def add_experience(self, amount, growth_rate=None):
+    # campos alterados por add_experience
+    EXPERIENCE_FIELDS = ("exp", "level", "max_exp", "attribute_points")
+
+    def add_experience(self, amount, growth_rate=None, save=True):
         """
         Adiciona XP e aplica lógica de subir de nível.
         growth_rate = fator de crescimento (ex: 1.5 = 50% mais difícil a cada nível)
+        save=False deixa a gravação para quem chamou (ver EXPERIENCE_FIELDS).
         """
         if growth_rate is None:
-            growth_rate = (
-                CharactersConfig.objects.first().level_growth_rate
-            )  # configurável no BD
+            from .config import characters_config
+
+            growth_rate = characters_config.get().level_growth_rate  # configurável no BD
 
         self.exp += amount
 
-        leveled_up = False
-        # loop para tratar casos em que ganha XP suficiente para subir vários níveis
-        while self.exp >= self.max_exp:
-            self.exp -= self.max_exp
-            self.level += 1
-            self.attribute_points += 1
-            # recalcula xp para próximo nível
-            self.max_exp = int(self.max_exp * growth_rate)
-            leveled_up = True
-
-        self.save()
-        return leveled_up
+        # pode subir vários níveis de uma vez (ver character/progression.py)
+        levels, self.exp, self.max_exp = level_up(self.exp, self.max_exp, growth_rate)
+        self.level += levels
+        self.attribute_points += levels
+
+        if save:
+            self.save()
+        return levels > 0
     
     # --- ATRIBUTOS SECUNDÁRIOS ---
     @property
     def physical_damage(self):
-        final = self.final_attr
-        return final["strength"] + final["courage"] * 0.1
+        return self._stored_combat_stats()["secondary"]["physical_damage"]
 
     @property
     def magical_damage(self):
-        final = self.final_attr
-        return final["arcane"] + final["courage"] * 0.1
+        return self._stored_combat_stats()["secondary"]["magical_damage"]
 
     @property
     def accuracy(self):
-        final = self.final_attr
-        return final["dexterity"] + final["courage"] * 0.1
+        return self._stored_combat_stats()["secondary"]["accuracy"]
 
     @property
     def crit_chance(self):
-        final = self.final_attr
-        return min(final["luck"] * 0.5, 50)
+        return self._stored_combat_stats()["secondary"]["crit_chance"]
 
     @property
     def crit_damage(self):
-        final = self.final_attr
-        value = 1 + final["dexterity"] * 0.1 + final["courage"] * 0.01 + final["arcane"] * 0.01
-        return round(value, 2)
+        return self._stored_combat_stats()["secondary"]["crit_damage"]
 
     @property
     def total_hp(self):
-        final = self.final_attr
-        return final["constitution"] * 10
+        return self._stored_combat_stats()["secondary"]["total_hp"]
 
     @property
     def total_mana(self):
-        final = self.final_attr
-        return final["arcane"] * 10
+        return self._stored_combat_stats()["secondary"]["total_mana"]
     
     def clean(self):
 
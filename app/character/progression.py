@@ -0,0 +1,72 @@
+# character/progression.py
+"""
+Curva de XP de personagens e profissões.
+
+A cada nível o XP necessário vira ``int(max_exp * growth_rate)``. Em vez de
+subir um nível por vez, ``level_up`` usa uma tabela (em cache) com o XP
+acumulado dos próximos níveis e acha o novo nível com ``bisect``. A tabela é
+montada com exatamente as mesmas contas do laço antigo, então o resultado é
+idêntico, só que grandes quantidades de XP custam O(log n).
+"""
+from bisect import bisect_right
+from functools import lru_cache
+
+CURVE_LENGTH = 256       # níveis por tabela
+CURVE_MAX_EXP = 2 ** 31  # acima disso a tabela para (limite do IntegerField)
+
+
+@lru_cache(maxsize=1024)
+def xp_curve(max_exp, growth_rate):
+    """
+    Tabela a partir de um nível que pede ``max_exp``: ``cumulative[k]`` é o XP
+    total para subir ``k`` níveis e ``requirements[k]`` o ``max_exp`` depois deles.
+    """
+    cumulative = [0]
+    requirements = [max_exp]
+    while len(cumulative) <= CURVE_LENGTH and cumulative[-1] < CURVE_MAX_EXP:
+        cumulative.append(cumulative[-1] + requirements[-1])
+        requirements.append(int(requirements[-1] * growth_rate))
+    return tuple(cumulative), tuple(requirements)
+
+
+def level_up(exp, max_exp, growth_rate):
+    """
+    Consome o XP acumulado. Retorna ``(níveis ganhos, exp restante, novo max_exp)``.
+    """
+    if max_exp <= 0:
+        raise ValueError(f"max_exp inválido: {max_exp}")
+
+    levels = 0
+    while exp >= max_exp:
+        cumulative, requirements = xp_curve(max_exp, growth_rate)
+        # maior k com cumulative[k] <= exp (k >= 1, já que exp >= max_exp)
+        gained = bisect_right(cumulative, exp) - 1
+        levels += gained
+        exp -= cumulative[gained]
+        max_exp = requirements[gained]
+        if max_exp <= 0:
+            raise ValueError(f"growth_rate {growth_rate} zera o XP necessário")
+    return levels, exp, max_exp
+
+
+def grant_experience(objects, amount, batch_size=500):
+    """
+    Dá XP a vários ``Character`` ou ``Profession`` (todos do mesmo modelo) e
+    grava tudo com um único ``bulk_update``. ``amount`` é o XP de cada um ou um
+    dicionário ``{pk: xp}``. Retorna quem subiu de nível.
+
+    Para profissões, carregue ``profession_type`` junto (``select_related``).
+    """
+    objects = list(objects)
+    if not objects:
+        return []
+
+    leveled = []
+    for obj in objects:
+        xp = amount.get(obj.pk, 0) if isinstance(amount, dict) else amount
+        if obj.add_experience(xp, save=False):
+            leveled.append(obj)
+
+    model = type(objects[0])
+    model.objects.bulk_update(objects, model.EXPERIENCE_FIELDS, batch_size=batch_size)
+    return leveled
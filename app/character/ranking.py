@@ -0,0 +1,128 @@
+# character/ranking.py
+"""
+Ranking de jogadores com paginação por cursor (keyset / "seek").
+
+A ordem é ``(-level, -exp, id)``, coberta pelo índice ``character_ranking_idx``.
+Cada página guarda no cursor a chave da sua última (ou primeira) linha e a
+posição dela no ranking; a próxima página busca "as N linhas depois desta
+chave" direto no índice, sem ``OFFSET`` nem ``COUNT(*)``. Assim a página 500
+custa o mesmo que a página 1.
+
+O total de jogadores (para o "Página X de Y") é aproximado: vem do cache do
+Django e é recontado a cada ``RANKING_TOTAL_TTL`` segundos.
+"""
+import base64
+
+from django.core.cache import cache
+from django.db.models import Q
+
+from .models import Character
+
+RANKING_PAGE_SIZE = 20
+RANKING_TOTAL_KEY = "character_ranking_total"
+RANKING_TOTAL_TTL = 300  # segundos
+
+
+def ranking_queryset():
+    return Character.objects.filter(type="player").order_by("-level", "-exp", "id")
+
+
+def encode_cursor(character, position):
+    raw = f"{character.level}.{character.exp}.{character.id}.{position}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """``(level, exp, id, posição)`` ou ``None`` se o cursor for inválido."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        level, exp, pk, position = (int(part) for part in raw.split("."))
+    except (ValueError, UnicodeDecodeError):
+        return None
+    if position < 1:
+        return None
+    return level, exp, pk, position
+
+
+def _after(level, exp, pk):
+    # linhas depois de (level, exp, pk) na ordem (-level, -exp, id); o level__lte
+    # na frente deixa o banco começar a varredura do índice já na posição certa
+    return Q(level__lte=level) & (Q(level__lt=level) | Q(exp__lt=exp) | Q(exp=exp, id__gt=pk))
+
+
+def _before(level, exp, pk):
+    return Q(level__gte=level) & (Q(level__gt=level) | Q(exp__gt=exp) | Q(exp=exp, id__lt=pk))
+
+
+def approximate_total():
+    return cache.get_or_set(RANKING_TOTAL_KEY, lambda: ranking_queryset().count(), RANKING_TOTAL_TTL)
+
+
+class RankingPage:
+    """Página do ranking; imita o que o template usava do ``Page`` do Django."""
+
+    def __init__(self, object_list, start_index, has_previous, has_next, per_page):
+        self.object_list = object_list
+        self.start_index = start_index
+        self.per_page = per_page
+        self.has_previous = has_previous
+        self.has_next = has_next
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def number(self):
+        return (self.start_index - 1) // self.per_page + 1
+
+    @property
+    def num_pages(self):
+        # nunca menor que a página atual, mesmo com o total desatualizado
+        pages = -(-approximate_total() // self.per_page)
+        return max(pages, self.number + (1 if self.has_next else 0), 1)
+
+    @property
+    def next_cursor(self):
+        if not self.has_next:
+            return None
+        return encode_cursor(self.object_list[-1], self.start_index + len(self.object_list) - 1)
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous:
+            return None
+        return encode_cursor(self.object_list[0], self.start_index)
+
+
+def ranking_page(after=None, before=None, per_page=RANKING_PAGE_SIZE):
+    """
+    Página depois do cursor ``after`` ou antes do cursor ``before`` (tokens de
+    ``RankingPage.next_cursor``/``previous_cursor``). Sem cursor, a primeira página.
+    """
+    queryset = ranking_queryset().only("id", "name", "level", "exp")
+
+    cursor = decode_cursor(before)
+    if cursor:
+        level, exp, pk, position = cursor
+        rows = list(queryset.filter(_before(level, exp, pk)).reverse()[:per_page + 1])
+        if len(rows) > per_page:
+            rows = rows[:per_page][::-1]
+            return RankingPage(rows, max(1, position - per_page), True, True, per_page)
+        # chegou ao topo: devolve a primeira página completa
+        after = None
+
+    cursor = decode_cursor(after)
+    if cursor:
+        level, exp, pk, position = cursor
+        queryset = queryset.filter(_after(level, exp, pk))
+        start_index = position + 1
+    else:
+        start_index = 1
+
+    rows = list(queryset[:per_page + 1])
+    return RankingPage(rows[:per_page], start_index, start_index > 1, len(rows) > per_page, per_page)
@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Disparado quando os atributos de combate de um personagem mudam
+# (troca de equipamento ou gasto de ponto de atributo).
+# Argumentos: sender=Character, instance=<Character>
+combat_stats_changed = Signal()
@@ -1,3 +1,171 @@
+import base64
+import random
+
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from combat.adapters import combatant_from_model
+from items.models import Equipment, Item
+
+from .config import characters_config
+from .constants import EQUIPMENT_SLOTS
+from .models import Character, CharactersConfig
+from .progression import CURVE_LENGTH, grant_experience, level_up
+from .ranking import RANKING_TOTAL_KEY, decode_cursor, encode_cursor, ranking_page, ranking_queryset
+
+
+class WithLoadoutTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        character = Character(name="Equipado", type="npc")
+        for slot in EQUIPMENT_SLOTS:
+            item = Item.objects.create(name=slot, description="", emoji="🛡️", item_type="equipment")
+            equipment = Equipment.objects.create(
+                item=item,
+                slot=slot.removeprefix("equipped_"),
+                attribute_bonuses={"constitution": 1},
+                stats={"defense": {"value": 2, "weakness": "slash"}},
+                passive_skill={"name": slot, "trigger": "on_attack", "effects": []},
+            )
+            setattr(character, slot, equipment)
+        character.save()
+        cls.character_id = character.pk
+
+    def test_fully_equipped_character_loads_in_one_query(self):
+        with self.assertNumQueries(1):
+            character = Character.objects.with_loadout().get(pk=self.character_id)
+            names = [getattr(character, slot).item.name for slot in EQUIPMENT_SLOTS]
+            character.refresh_combat_stats()
+            combatant_from_model(character)
+
+        self.assertEqual(names, list(EQUIPMENT_SLOTS))
+        self.assertEqual(character.final_attr["constitution"], 1 + len(EQUIPMENT_SLOTS))
+        self.assertEqual(character.get_total_weakness("slash"), 0.45)
+
+
+
+def level_up_one_by_one(exp, max_exp, growth_rate):
+    """O laço antigo de add_experience, um nível por vez (referência para level_up)."""
+    levels = 0
+    while exp >= max_exp:
+        exp -= max_exp
+        levels += 1
+        max_exp = int(max_exp * growth_rate)
+    return levels, exp, max_exp
+
+
+class LevelUpTests(TestCase):
+    def test_matches_level_by_level_loop(self):
+        rng = random.Random(7)
+        for _ in range(2000):
+            growth_rate = rng.choice((1.1, 1.25, 1.37, 1.5, 2.0, 3.0))
+            max_exp = rng.choice((100, 150, 225, rng.randint(50, 5000)))
+            exp = rng.choice((rng.randint(0, 1000), rng.randint(0, 10 ** 6), rng.randint(0, 2 ** 31)))
+            self.assertEqual(
+                level_up(exp, max_exp, growth_rate),
+                level_up_one_by_one(exp, max_exp, growth_rate),
+                (exp, max_exp, growth_rate),
+            )
+
+    def test_jumps_across_several_tables(self):
+        # crescimento lento: o XP passa de várias tabelas de CURVE_LENGTH níveis
+        for exp, max_exp, growth_rate in ((10 ** 6, 100, 1.0), (5 * 10 ** 6, 100, 1.01), (10 ** 5, 7, 1.0)):
+            levels, _, _ = expected = level_up_one_by_one(exp, max_exp, growth_rate)
+            self.assertGreater(levels, 2 * CURVE_LENGTH)
+            self.assertEqual(level_up(exp, max_exp, growth_rate), expected)
+
+    def test_rejects_non_positive_requirement(self):
+        with self.assertRaises(ValueError):
+            level_up(10, 0, 1.5)
+
+
+class GrantExperienceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        CharactersConfig.objects.create(level_growth_rate=1.5)
+        cls.characters = [Character.objects.create(name=f"P{i}", type="npc") for i in range(3)]
+
+    def test_grants_per_character_amounts_in_one_update(self):
+        characters = list(Character.objects.filter(pk__in=[c.pk for c in self.characters]).order_by("pk"))
+        amounts = {characters[0].pk: 50, characters[1].pk: 100, characters[2].pk: 10 ** 5}
+
+        characters_config.get()  # fora da contagem
+        with self.assertNumQueries(1):
+            leveled = grant_experience(characters, amounts)
+
+        self.assertEqual([c.pk for c in leveled], [characters[1].pk, characters[2].pk])
+        for character in characters:
+            expected_levels, expected_exp, expected_max = level_up_one_by_one(amounts[character.pk], 100, 1.5)
+            saved = Character.objects.get(pk=character.pk)
+            self.assertEqual(
+                (saved.level, saved.exp, saved.max_exp, saved.attribute_points),
+                (1 + expected_levels, expected_exp, expected_max, expected_levels),
+            )
+
+
+class RankingPageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # 7 jogadores empatados em (level, exp), para o empate cruzar o limite das páginas
+        levels = [(5, 10)] * 7 + [(9, 0), (4, 80), (4, 80), (3, 0), (1, 0)]
+        Character.objects.bulk_create(
+            Character(name=f"J{i}", type="player", level=level, exp=exp) for i, (level, exp) in enumerate(levels)
+        )
+        Character.objects.create(name="Monstro", type="monster", level=99)
+
+    def setUp(self):
+        cache.delete(RANKING_TOTAL_KEY)
+        self.expected = list(ranking_queryset().values_list("id", flat=True))
+
+    def walk_forward(self, per_page):
+        pages = [ranking_page(per_page=per_page)]
+        while pages[-1].has_next:
+            pages.append(ranking_page(after=pages[-1].next_cursor, per_page=per_page))
+        return pages
+
+    def test_forward_walk_with_ties_across_pages(self):
+        pages = self.walk_forward(per_page=3)
+
+        self.assertEqual([c.id for page in pages for c in page], self.expected)
+        self.assertEqual([page.start_index for page in pages], [1, 4, 7, 10])
+        self.assertEqual([page.number for page in pages], [1, 2, 3, 4])
+        self.assertFalse(pages[0].has_previous)
+        self.assertEqual(pages[-1].num_pages, 4)
+
+    def test_backward_walk_returns_same_pages(self):
+        pages = self.walk_forward(per_page=3)
+
+        page = pages[-1]
+        for expected in reversed(pages[:-1]):
+            page = ranking_page(before=page.previous_cursor, per_page=3)
+            self.assertEqual([c.id for c in page], [c.id for c in expected])
+            self.assertEqual(page.start_index, expected.start_index)
+
+    def test_before_cursor_landing_on_first_page(self):
+        # a partir da 2ª página de 5, voltar cai no topo (e no meio do empate)
+        second = ranking_page(after=ranking_page(per_page=5).next_cursor, per_page=5)
+        first = ranking_page(before=second.previous_cursor, per_page=5)
+
+        self.assertEqual([c.id for c in first], self.expected[:5])
+        self.assertEqual(first.start_index, 1)
+        self.assertFalse(first.has_previous)
+        self.assertTrue(first.has_next)
+
+        # mesmo com menos de uma página antes do cursor, volta a primeira página completa
+        third = ranking_page(after=ranking_page(per_page=2).next_cursor, per_page=2)
+        first = ranking_page(before=third.previous_cursor, per_page=5)
+        self.assertEqual([c.id for c in first], self.expected[:5])
+        self.assertEqual(first.start_index, 1)
+
+    def test_invalid_cursors_fall_back_to_first_page(self):
+        first = [c.id for c in ranking_page(per_page=3)]
+        tampered = base64.urlsafe_b64encode(b"5.10.1.0").decode()  # posição 0
+        for token in ("", "lixo", "!!!", base64.urlsafe_b64encode(b"a.b.c.d").decode(), tampered):
+            with self.subTest(token=token):
+                self.assertIsNone(decode_cursor(token) if token else None)
+                self.assertEqual([c.id for c in ranking_page(after=token, per_page=3)], first)
+                self.assertEqual([c.id for c in ranking_page(before=token, per_page=3)], first)
+
+    def test_cursor_round_trip(self):
+        character = Character.objects.get(name="J8")
+        self.assertEqual(decode_cursor(encode_cursor(character, 12)), (4, 80, character.id, 12))
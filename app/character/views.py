@@ -1,13 +1,14 @@
 # character/views.py
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
 from .models import Character
+from .ranking import ranking_page
+from .signals import combat_stats_changed
 from tasks.models import Profession
 
 @login_required
 def character_detail(request):
-    character = Character.objects.get(user=request.user)
+    character = Character.objects.with_loadout().get(user=request.user)
 
     if request.method == "POST":
         attr = request.POST.get("attribute")
@@ -25,7 +26,9 @@ def character_detail(request):
             old_value = getattr(character, attr)
             setattr(character, attr, old_value + 1)
             character.attribute_points -= 1
+            character.refresh_combat_stats()
             character.save()
+            combat_stats_changed.send(sender=Character, instance=character)
 
         return redirect("character_detail")
 
@@ -40,7 +43,7 @@ def character_detail(request):
 
 @login_required
 def public_character_view(request, character_id):
-    character = get_object_or_404(Character, id=character_id)
+    character = get_object_or_404(Character.objects.with_loadout(), id=character_id)
 
     professions = (
         Profession.objects
@@ -58,20 +61,12 @@ def public_character_view(request, character_id):
 def character_ranking(request):
     character = Character.objects.get(user=request.user)
 
-    # Filtra apenas jogadores e ordena
-    ranking_list = (
-        Character.objects
-        .filter(type="player")
-        .order_by("-level", "-exp")
+    # paginação por cursor (?after=... / ?before=...), ver character/ranking.py
+    page_obj = ranking_page(
+        after=request.GET.get("after"),
+        before=request.GET.get("before"),
     )
 
-    # Paginação: 20 por página (pode mudar!)
-    paginator = Paginator(ranking_list, 20)
-
-    # pagina atual que vem do GET ?page=2
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
-
     return render(
         request,
         "character/ranking.html",
@@ -0,0 +1,120 @@
+# combat/adapters.py
+"""
+Camada Django do combate: converte os modelos em ``Combatant`` para o núcleo
+(combat/engine.py) e aplica o ``BattleResult`` de volta nos modelos.
+"""
+import random
+
+from character.models import loadout_related
+
+from .battle import Combatant, CombatantSnapshot, safe_get_equipment_passives
+from .engine import run_combat
+from .group import run_group_combat
+from .log import BattleLog
+
+
+def build_passives_from_equipment(owner):
+    passives = []
+    for slot in (
+        "equipped_head", "equipped_necklace", "equipped_shoulders",
+        "equipped_chest", "equipped_hands", "equipped_feet"
+    ):
+        eq = getattr(owner, slot, None)
+        if eq:
+            passives += safe_get_equipment_passives(eq)
+    return passives
+
+
+def combatant_from_model(entity, with_passives=True):
+    """``Character`` (personagem ou monstro) -> ``Combatant``."""
+    return Combatant(
+        name=entity.name,
+        snapshot=CombatantSnapshot.from_character(entity),
+        hp=entity.hp,
+        mana=entity.mana,
+        passives=build_passives_from_equipment(entity) if with_passives else (),
+    )
+
+
+BATTLE_RESULT_FIELDS = ("hp", "mana")
+
+
+def apply_battle_result(character, battle):
+    """
+    Copia hp/mana do fim da batalha (``BattleResult``) para o personagem, sem salvar.
+    Retorna os campos alterados, para um ``save(update_fields=...)``/``update()`` único.
+    """
+    character.hp = max(0, int(battle.char_hp))
+    character.mana = max(0, int(battle.char_mana))
+    return BATTLE_RESULT_FIELDS
+
+
+def run_battle(character, monster, seed=None, mode="full", defender=None):
+    """
+    Executa o combate entre dois modelos e retorna um dicionário com tudo que
+    a view precisa (``battle`` é o ``BattleResult`` do núcleo).
+
+    ``defender`` é um ``Combatant`` já pronto para o lado do monstro (ex.: o
+    snapshot de defesa da arena); sem ele, o combatente é montado do modelo.
+
+    A batalha não grava nada no banco: a view persiste com ``apply_battle_result``.
+    """
+    char = combatant_from_model(character)
+    if defender is None:
+        defender = combatant_from_model(monster, with_passives=False)  # seus monstros mock não têm passivas por enquanto
+    mon = defender
+
+    battle = run_combat(char, mon, seed=seed, mode=mode)
+
+    if mode == "summary":
+        return {
+            "winner": battle.winner,
+            "turns": battle.turns,
+            "damage_dealt": battle.damage_dealt,
+            "damage_taken": battle.damage_taken,
+            "char_hp": battle.char_hp,
+            "mon_hp": battle.mon_hp,
+            "battle": battle,
+            "seed": battle.seed,
+        }
+
+    battle_log = BattleLog(
+        battle.events,
+        names=(char.name, mon.name),
+        passives=(char.passives, mon.passives),
+        initial_hp=(battle.initial["char_hp"], battle.initial["mon_hp"]),
+    )
+
+    return {
+        "battle_log": battle_log,
+        "winner": battle.winner,
+        "monster": monster,
+        "character": character,
+        "battle_stats": battle.battle_stats,
+        "battle": battle,
+        "seed": battle.seed,
+        "events": battle.events,
+        "initial": battle.initial,
+        "snapshot_hash": battle.snapshot_hash,
+    }
+
+
+def hunt_pack(hunt, rng=random):
+    """
+    Sorteia o bando de monstros de uma ``Hunt``: cada ``HuntMonster`` entra com
+    a sua ``chance``; se nenhum for sorteado, vem o primeiro.
+    """
+    hunt_monsters = list(hunt.monsters.select_related(*loadout_related("monster")))
+    pack = [hm.monster for hm in hunt_monsters if rng.uniform(0, 100) <= hm.chance]
+    if not pack and hunt_monsters:
+        pack = [hunt_monsters[0].monster]
+    return pack
+
+
+def run_party_battle(characters, monsters, seed=None):
+    """Combate em grupo entre modelos (ver combat/group.py); retorna o ``GroupBattleResult``."""
+    return run_group_combat(
+        [combatant_from_model(character) for character in characters],
+        [combatant_from_model(monster, with_passives=False) for monster in monsters],
+        seed=seed,
+    )
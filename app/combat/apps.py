@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CombatConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "combat"
+
+    def ready(self):
+        import combat.signals
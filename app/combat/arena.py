@@ -0,0 +1,159 @@
+# combat/arena.py
+"""
+Gravação dos pontos da arena sem perder atualizações concorrentes.
+
+Uma luta: os pontos dos dois são lidos, o ganho é calculado e os DOIS são
+gravados num único UPDATE condicional (``points = points + delta`` só onde
+``points`` ainda é o valor lido). Se outra luta mudou algum dos dois no meio
+do caminho, nada é gravado e a conta é refeita.
+
+Várias lutas (torneios, lotes): as linhas envolvidas são travadas com
+``select_for_update``, os pontos são recalculados luta a luta e gravados com um
+único ``bulk_update``.
+
+Quem é desafiado luta com o ``defender_snapshot`` do seu ranking: os atributos
+de combate já compilados, atualizados quando o personagem troca de
+equipamento ou distribui pontos. A luta lê só essa linha (e a do personagem),
+sem carregar os equipamentos.
+"""
+from django.db import transaction
+from django.db.models import Case, F, Q, When
+
+from .battle import Combatant, CombatantSnapshot
+from .leaderboard import leaderboard
+from .models import ArenaRanking
+from .utils import calculate_arena_points
+
+OPTIMISTIC_ATTEMPTS = 3
+
+
+def refresh_defender_snapshot(character):
+    """Recompila e grava o snapshot de defesa do personagem. Retorna o ``CombatantSnapshot``."""
+    snapshot = CombatantSnapshot.from_character(character)
+    ArenaRanking.objects.filter(character=character).update(defender_snapshot=snapshot.to_dict())
+    return snapshot
+
+
+def defender_combatant(ranking):
+    """
+    ``Combatant`` de quem é desafiado, a partir do ``defender_snapshot`` (hp e
+    mana atuais vêm do personagem). Snapshots vazios ou de outra versão são
+    recompilados na hora.
+    """
+    character = ranking.character
+    snapshot = CombatantSnapshot.from_dict(ranking.defender_snapshot)
+    if snapshot is None:
+        snapshot = refresh_defender_snapshot(character)
+    return Combatant(character.name, snapshot, character.hp, character.mana)
+
+
+def apply_results(points, fights):
+    """
+    Aplica ``calculate_arena_points`` luta a luta (na ordem) sobre ``points``.
+    ``fights`` é uma sequência de ``(desafiante, desafiado, desafiante venceu)``.
+    """
+    for attacker_id, defender_id, attacker_won in fights:
+        gained_attacker, gained_defender = calculate_arena_points(
+            points[attacker_id], points[defender_id], attacker_won=attacker_won,
+        )
+        points[attacker_id] += gained_attacker
+        points[defender_id] += gained_defender
+    return points
+
+
+def _load_points(queryset, character_ids):
+    points = dict(queryset.filter(character_id__in=character_ids).values_list("character_id", "points"))
+    missing = set(character_ids) - points.keys()
+    if missing:
+        raise ArenaRanking.DoesNotExist(f"Personagens sem ranking na arena: {sorted(missing)}")
+    return points
+
+
+def _try_conditional_update(attacker_id, defender_id, attacker_won):
+    with transaction.atomic():
+        points = _load_points(ArenaRanking.objects, (attacker_id, defender_id))
+        old_attacker, old_defender = points[attacker_id], points[defender_id]
+        gained_attacker, gained_defender = calculate_arena_points(
+            old_attacker, old_defender, attacker_won=attacker_won,
+        )
+
+        updated = ArenaRanking.objects.filter(
+            Q(character_id=attacker_id, points=old_attacker)
+            | Q(character_id=defender_id, points=old_defender)
+        ).update(
+            points=Case(
+                When(character_id=attacker_id, then=F("points") + gained_attacker),
+                default=F("points") + gained_defender,
+            )
+        )
+        if updated != 2:
+            # alguém mudou os pontos depois da leitura: desfaz e tenta de novo
+            transaction.set_rollback(True)
+            return None
+
+        new_points = {attacker_id: old_attacker + gained_attacker, defender_id: old_defender + gained_defender}
+        transaction.on_commit(lambda: leaderboard.update_many(new_points))
+        return gained_attacker, gained_defender
+
+
+def apply_fight_result(attacker_id, defender_id, attacker_won):
+    """
+    Aplica o resultado de UMA luta (ids dos personagens) e retorna os pontos
+    ganhos ``(desafiante, desafiado)``.
+    """
+    if attacker_id == defender_id:
+        raise ValueError("Um personagem não pode lutar contra si mesmo na arena.")
+
+    for _ in range(OPTIMISTIC_ATTEMPTS):
+        gained = _try_conditional_update(attacker_id, defender_id, attacker_won)
+        if gained is not None:
+            return gained
+
+    # muita disputa pelas mesmas linhas: trava e aplica (o ganho sai das linhas travadas)
+    before, after = _apply_locked([(attacker_id, defender_id, attacker_won)])
+    return after[attacker_id] - before[attacker_id], after[defender_id] - before[defender_id]
+
+
+def apply_fight_results(fights):
+    """
+    Aplica um lote de lutas ``(desafiante, desafiado, desafiante venceu)``, na
+    ordem, sobre os pontos atuais do banco. Retorna os pontos finais de todos
+    os envolvidos.
+    """
+    return _apply_locked(fights)[1]
+
+
+def _apply_locked(fights):
+    """``apply_fight_results`` que devolve também os pontos lidos sob a trava: ``(antes, depois)``."""
+    fights = list(fights)
+    character_ids = {character_id for fight in fights for character_id in fight[:2]}
+    if not character_ids:
+        return {}, {}
+
+    with transaction.atomic():
+        rankings = {
+            ranking.character_id: ranking
+            for ranking in ArenaRanking.objects.select_for_update()
+            .filter(character_id__in=character_ids)
+            .order_by("pk")  # trava sempre na mesma ordem, evitando deadlocks
+        }
+        missing = character_ids - rankings.keys()
+        if missing:
+            raise ArenaRanking.DoesNotExist(f"Personagens sem ranking na arena: {sorted(missing)}")
+
+        before = {cid: r.points for cid, r in rankings.items()}
+        points = apply_results(dict(before), fights)
+
+        changed = []
+        for character_id, ranking in rankings.items():
+            if ranking.points != points[character_id]:
+                ranking.points = points[character_id]
+                changed.append(ranking)
+        ArenaRanking.objects.bulk_update(changed, ["points"], batch_size=500)
+
+        # bulk_update não dispara sinais
+        new_points = {ranking.character_id: ranking.points for ranking in changed}
+        if new_points:
+            transaction.on_commit(lambda: leaderboard.update_many(new_points))
+
+    return before, points
@@ -1,26 +1,193 @@
 import random
 import logging
-from copy import deepcopy
-from django.utils import timezone
+
+from .events import BattleEvent, EVENT_PASSIVE_NO_MANA, passive_ref
 
 logger = logging.getLogger(__name__)
 
 
-VALID_TRIGGERS = {"on_turn_start", "on_attack", "on_defend", "on_hit", "on_receive_damage"}
+ARMOR_SLOTS = (
+    "equipped_head",
+    "equipped_necklace",
+    "equipped_shoulders",
+    "equipped_chest",
+    "equipped_feet",
+)
+
+
+class CombatantSnapshot:
+    """
+    Atributos de combate de um combatente compilados UMA vez por batalha.
+
+    Tudo que depende apenas do personagem e dos equipamentos (atributos finais,
+    secundários, dano da arma, armadura total e fraqueza) é calculado aqui,
+    evitando percorrer os slots de equipamento a cada golpe. Durante o combate
+    apenas os modificadores temporários (``_temp_attrs``) são reaplicados.
+    """
+
+    __slots__ = (
+        "attrs",
+        "secondary",
+        "accuracy",
+        "dexterity",
+        "weapon_damage",
+        "attack_type",
+        "attack_style",
+        "armor",
+        "weakness",
+    )
+
+    def __init__(self, attrs, dexterity=None, weapon_damage=0, attack_type="physical", armor=0, weakness=None,
+                 attack_style=None):
+        self.attrs = attrs
+        self.secondary = compute_secondary_stats(attrs)
+        self.accuracy = self.secondary["accuracy"]
+        # a chance de acerto usa a destreza BASE do defensor (sem equipamentos)
+        self.dexterity = attrs.get("dexterity", 0) if dexterity is None else dexterity
+        self.weapon_damage = weapon_damage
+        self.attack_type = attack_type
+        self.attack_style = attack_style
+        self.armor = armor
+        # {estilo de ataque: fração de dano extra}, ver Character.weakness_vector
+        self.weakness = weakness or {}
+
+    def weakness_against(self, attacker):
+        """Dano extra (fração) que o estilo da arma de ``attacker`` causa neste combatente."""
+        return self.weakness.get(attacker.attack_style, 0.0)
+
+    @classmethod
+    def from_character(cls, entity):
+        weapon_damage = 0
+        attack_type = "physical"
+        attack_style = None
+
+        weapon = getattr(entity, "equipped_hands", None)
+        if weapon:
+            attack = weapon.parsed_stats.attack
+            if isinstance(attack.value, (int, float)):
+                weapon_damage = attack.value
+            if isinstance(attack.type, str):
+                attack_type = attack.type
+            if isinstance(attack.style, str):
+                attack_style = attack.style
+
+        armor = 0
+        for slot in ARMOR_SLOTS:
+            equip = getattr(entity, slot, None)
+            if not equip:
+                continue
+            armor_value = equip.parsed_stats.defense.value
+            if isinstance(armor_value, int):
+                armor += armor_value
+
+        return cls(
+            attrs=entity.final_attr,
+            dexterity=entity.dexterity,
+            weapon_damage=weapon_damage,
+            attack_type=attack_type,
+            armor=armor,
+            weakness=entity.weakness_vector or entity.compute_weakness_vector(),
+            attack_style=attack_style,
+        )
+
+    SERIAL_VERSION = 2
+
+    def to_dict(self):
+        """Forma compacta (JSON) do snapshot, ver ``from_dict``."""
+        return {
+            "v": self.SERIAL_VERSION,
+            "attrs": self.attrs,
+            "dexterity": self.dexterity,
+            "weapon_damage": self.weapon_damage,
+            "attack_type": self.attack_type,
+            "attack_style": self.attack_style,
+            "armor": self.armor,
+            "weakness": self.weakness,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Inverso de ``to_dict``. Retorna ``None`` se ``data`` estiver vazio ou em outra versão."""
+        if not data or data.get("v") != cls.SERIAL_VERSION:
+            return None
+        return cls(
+            attrs=data["attrs"],
+            dexterity=data["dexterity"],
+            weapon_damage=data["weapon_damage"],
+            attack_type=data["attack_type"],
+            armor=data["armor"],
+            weakness=data["weakness"],
+            attack_style=data["attack_style"],
+        )
+
+    def key(self):
+        """Tupla com tudo que influencia o combate (para hashes/fingerprints)."""
+        return (
+            tuple(sorted(self.attrs.items())),
+            self.dexterity,
+            self.weapon_damage,
+            self.attack_type,
+            self.attack_style,
+            self.armor,
+            tuple(sorted(self.weakness.items())),
+        )
+
+
+
+class Combatant:
+    """
+    Descrição de um combatente independente do ORM: nome, snapshot dos
+    atributos, hp/mana no início da luta e as passivas (JSON cru dos
+    equipamentos). Só tem tipos simples, então pode ser enviado (pickle)
+    para outros processos.
+
+    Os modelos viram ``Combatant`` em ``combat/adapters.py``.
+    """
+
+    __slots__ = ("name", "snapshot", "hp", "mana", "passives")
+
+    def __init__(self, name, snapshot, hp, mana, passives=()):
+        self.name = name
+        self.snapshot = snapshot
+        self.hp = hp
+        self.mana = mana
+        self.passives = list(passives)
+
 
 def compute_final_attrs(state):
     """
     Retorna os atributos PRIMÁRIOS após aplicar buffs/debuffs temporários.
-    Esses atributos serão usados pelas propriedades secundárias do Character.
+    Sem modificadores ativos, devolve o próprio dicionário do snapshot
+    (que não deve ser alterado).
     """
-    obj = state["obj"]
-    final = obj.final_attr.copy()
+    snapshot = state["snapshot"]
+    temp_attrs = state.get("_temp_attrs")
+    if not temp_attrs:
+        return snapshot.attrs
 
-    for attr, delta in state.get("_temp_attrs", {}).items():
+    final = snapshot.attrs.copy()
+    for attr, delta in temp_attrs.items():
         final[attr] = final.get(attr, 0) + delta
 
     return final
 
+
+def compute_state_secondary_stats(state):
+    """
+    Atributos secundários do combatente no momento atual da batalha.
+
+    Ficam guardados em ``state["_secondary"]``; quem altera ``_temp_attrs``
+    zera esse cache (``None``) e o próximo acesso recalcula uma única vez.
+    """
+    secondary = state.get("_secondary")
+    if secondary is None:
+        if state.get("_temp_attrs"):
+            secondary = compute_secondary_stats(compute_final_attrs(state))
+        else:
+            secondary = state["snapshot"].secondary
+        state["_secondary"] = secondary
+    return secondary
+
 def compute_secondary_stats(final_attrs):
     """
     Computa atributos secundários a partir de atributos primários já modificados.
@@ -60,8 +227,8 @@ def safe_get_equipment_passives(equipment):
 
     return [passive]
 
-def roll_chance(percent):
-    return random.random() * 100.0 < float(percent)
+def roll_chance(percent, rng=random):
+    return rng.random() * 100.0 < float(percent)
 
 def compute_hit_chance(attacker, defender):
     # 65% + (attacker.accuracy - defender.dexterity) * 2 (tweakable)
@@ -72,206 +239,74 @@ def compute_hit_chance(attacker, defender):
     hit = max(5.0, min(95.0, hit))
     return hit
 
-def compute_damage(attacker_state, defender_state, damage_type="physical"):
-    logger.info("===== COMPUTE DAMAGE =====")
-    logger.info(f"Damage type: {damage_type}")
-
-    # --------------------------------------------------------
-    #   1. Atributos finais (primários)
-    # --------------------------------------------------------
-    atk_primary = compute_final_attrs(attacker_state)
-    def_primary = compute_final_attrs(defender_state)
-
-    logger.debug(f"Attacker PRIMARY: {atk_primary}")
-    logger.debug(f"Defender PRIMARY: {def_primary}")
-
-    # --------------------------------------------------------
-    #   2. Atributos secundários
-    # --------------------------------------------------------
-    atk_sec = compute_secondary_stats(atk_primary)
-    def_sec = compute_secondary_stats(def_primary)
-
-    logger.debug(f"Attacker SECONDARY: {atk_sec}")
-    logger.debug(f"Defender SECONDARY: {def_sec}")
-
-    # --------------------------------------------------------
-    #   3. Base damage
-    # --------------------------------------------------------
+def compute_raw_damage(atk_snapshot, atk_sec, def_snapshot, def_sec, damage_type="physical"):
+    """
+    Dano antes da parte aleatória: atributos + arma menos metade da defesa
+    (atributo secundário + armadura dos equipamentos).
+    """
     if damage_type == "physical":
         base_dmg = atk_sec["physical_damage"]
     else:
         base_dmg = atk_sec["magical_damage"]
+    base_dmg += atk_snapshot.weapon_damage
 
-    logger.info(f"Base damage from stats ({damage_type}): {base_dmg}")
-
-    # --------------------------------------------------------
-    #   4. Weapon damage
-    # --------------------------------------------------------
-    weapon_damage = 0
-    attacker = attacker_state.get("obj")
-
-    if attacker:
-        try:
-            weapon_damage = attacker.equipped_hands.parsed_stats.attack.value or 0
-            base_dmg += weapon_damage
-            logger.info(f"Weapon damage: {weapon_damage}")
-        except Exception as e:
-            logger.warning(f"No weapon damage found: {e}")
-
-    logger.info(f"Base damage after weapon: {base_dmg}")
-
-    # --------------------------------------------------------
-    #   5. Defense
-    # --------------------------------------------------------
-    defender = defender_state.get("obj")
-    defense_value = def_sec["defense"]
-
-    logger.info(f"Initial defense (secondary stat): {defense_value}")
-
-    if defender:
-        slots = [
-            "equipped_head",
-            "equipped_necklace",
-            "equipped_shoulders",
-            "equipped_chest",
-            "equipped_feet",
-        ]
-
-        for slot in slots:
-            equip = getattr(defender, slot, None)
-            if not equip:
-                logger.debug(f"No equip in slot {slot}")
-                continue
-            logger.debug(f">>> {equip.parsed_stats.defense.value}")
-            armor_value = getattr(equip.parsed_stats.defense, "value", None)
-
-            logger.debug(
-                f"Slot {slot}: armor_value={armor_value} ({equip.item.name if equip else 'none'})"
-            )
+    defense_value = (def_sec["defense"] + def_snapshot.armor) * 0.5
 
-            if isinstance(armor_value, int):
-                defense_value += armor_value
+    return base_dmg - defense_value
 
-    logger.info(f"Total raw defense before 0.5 multiplier: {defense_value}")
 
-    defense_value *= 0.5
-    logger.info(f"Defense after multiplier: {defense_value}")
+def compute_damage(attacker_state, defender_state, damage_type="physical", rng=random):
+    atk_sec = compute_state_secondary_stats(attacker_state)
+    def_sec = compute_state_secondary_stats(defender_state)
+    def_snapshot = defender_state["snapshot"]
 
-    dmg = base_dmg - defense_value
-    logger.info(f"Damage after subtracting defense: {dmg}")
+    dmg = compute_raw_damage(attacker_state["snapshot"], atk_sec, def_snapshot, def_sec, damage_type)
 
     # Variação aleatória
-    random_variation = random.uniform(-1.0, 1.0)
+    random_variation = rng.uniform(-1.0, 1.0)
     dmg = max(1.0, dmg + random_variation)
 
-    logger.info(f"Damage after random variation ({random_variation}): {dmg}")
-
-    # --------------------------------------------------------
-    #   6. Critical hit
-    # --------------------------------------------------------
+    # Crítico
     crit = False
-    if random.random() < (atk_sec["crit_chance"] / 100):
+    if rng.random() < (atk_sec["crit_chance"] / 100):
         crit = True
         dmg *= atk_sec["crit_damage"]
-        logger.info(f"CRITICAL HIT! Crit multiplier: {atk_sec['crit_damage']}")
-
-    # --------------------------------------------------------
-    #   7. Weakness
-    # --------------------------------------------------------
-    weakness = defender_state.get("weakness", 0.0)
-    logger.info(f"Weakness multiplier: {weakness}")
 
+    # Fraqueza do defensor ao estilo da arma do atacante
+    weakness = def_snapshot.weakness_against(attacker_state["snapshot"])
     if weakness > 0:
         dmg *= (1 + weakness)
-        logger.info(f"Damage after weakness: {dmg}")
 
-    # --------------------------------------------------------
-    # RESULTADO FINAL
-    # --------------------------------------------------------
-    final_damage = int(max(1, round(dmg)))
+    # sem log por golpe: roda milhares de vezes por torneio e os eventos já
+    # registram o dano (ver combat/events.py)
+    return int(max(1, round(dmg))), crit
 
-    logger.info(f"FINAL DAMAGE = {final_damage}, CRITICAL = {crit}")
-    logger.info("===== END DAMAGE CALC =====\n")
 
-    return final_damage, crit
 
-
-
-def apply_effects_from_passives(passives, trigger, source_state, target_state, battle_state, logs):
+def apply_effects_from_passives(passives, trigger, source_state, target_state, battle_state):
     """
-    Passiva é um objeto (modelo) que precisa expor algo como:
-      - name, trigger (string)
-      - effects: JSON payloads que descrevem o efeito
-    Aqui apenas um esqueleto: se PassiveEffect tiver effect_type 'attribute_mod' com payload, aplicamos temporariamente.
+    Dispara as passivas (já compiladas por ``compile_passives``) de um trigger.
+    Só as passivas desse trigger são visitadas; cada uma cobra sua mana e
+    executa os efeitos pré-montados.
     """
-    for p in passives:
-        try:
-            if p.get("trigger") != trigger:
-                continue
+    entries = passives.get(trigger)
+    if not entries:
+        return
 
-            effects = p.get("effects", [])
-            if not effects:
+    for passive in entries:
+        try:
+            if passive.cost > source_state["mana"]:
+                if battle_state["events"] is not None:
+                    battle_state["events"].append(BattleEvent(
+                        battle_state["turn"], source_state["actor"], EVENT_PASSIVE_NO_MANA,
+                        0, False, passive_ref(passive.index),
+                    ))
                 continue
 
-            passive_name = p.get("name")
-            source_char = source_state.get("obj")
-            passive_cost = p.get("cost")
+            source_state["mana"] -= passive.cost
 
-            if source_char and passive_cost and passive_cost > source_char.mana:
-                logs.append(f"Passiva {passive_name} não pode ser ativada por falta de mana.")
-                continue
-            else:
-                source_char.mana -= passive_cost
-                source_char.save()
-
-            for effect in effects:
-
-                etype = effect.get("type")
-                payload = effect.get("payload") or {}
-                target = effect.get("target") or "self"
-
-                if etype in ("attribute_mod", "attr_mod"):
-                    attr = payload.get("attribute")
-                    val = payload.get("value", 0)
-                    duration = payload.get("duration", 1)
-                    tgt_state = source_state if target == "self" else target_state
-
-                    if attr:
-                        # pega valor atual (se já foi modificado) ou do objeto
-                        prev = tgt_state["_temp_attrs"].get(attr, getattr(tgt_state["obj"], attr, 0))
-                        tgt_state["_temp_attrs"][attr] = prev + val
-                        logs.append(
-                            f"Passiva {passive_name}: aplicou {val} em {attr} para {target} por {duration} turno(s)."
-                        )
-
-                elif etype == "status_effect":
-                    status_name = payload.get("status")
-                    duration = payload.get("duration", 1)
-                    logs.append(f"Passiva {passive_name}: aplicou status {status_name} em {target} por {duration} turno(s).")
-
-                elif etype == "deal_damage":
-                    dmg = payload.get("damage", 0)
-                    tgt_state = source_state if target == "self" else target_state
-                    tgt_state["obj"].hp -= dmg
-                    logs.append(f"Passiva {passive_name}: causou {dmg} de dano em {target}.")
-                # TODO: implement other effects.
+            for effect in passive.effects:
+                effect(source_state, target_state, battle_state)
         except Exception as e:
-            logger.exception("Erro aplicando passiva %s: %s", p, e)
+            logger.exception("Erro aplicando passiva %s: %s", passive.name, e)
             continue
-
-def group_battle_log_by_turns(battle_log):
-    turns = []
-    current_turn = None
-    current_messages = []
-    for line in battle_log:
-        if line.startswith("--- Turno "):
-            if current_turn is not None:
-                turns.append({"turn": current_turn, "messages": current_messages})
-            current_turn = int(line.split(" ")[2])
-            current_messages = []
-        else:
-            current_messages.append(line)
-    if current_turn is not None:
-        turns.append({"turn": current_turn, "messages": current_messages})
-    return turns
-
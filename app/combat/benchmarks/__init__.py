@@ -0,0 +1,7 @@
+# combat/benchmarks/__init__.py
+"""
+Benchmarks do motor de combate, sem banco de dados.
+
+Uso: ``python manage.py bench_combat --output bench.json [--compare antigo.json]``.
+"""
+from .runner import run_benchmarks, compare_results, write_results, load_results
@@ -0,0 +1,167 @@
+# combat/benchmarks/loadouts.py
+"""
+Personagens, monstros e equipamentos montados só em memória para os benchmarks.
+
+Nada aqui é salvo: as instâncias de ``Character``/``Equipment`` nunca recebem
+``pk`` e os equipamentos ficam direto no cache da ForeignKey, então o motor de
+combate roda sem tocar no banco.
+"""
+from character.models import Character
+from items.models import Item, ItemType, Equipment
+
+
+def make_equipment(name, slot, stats=None, bonuses=None, passive=None):
+    item = Item(name=name, item_type=ItemType.EQUIPMENT)
+    return Equipment(
+        item=item,
+        slot=slot,
+        stats=stats or {},
+        attribute_bonuses=bonuses or {},
+        passive_skill=passive or {},
+    )
+
+
+def _attack(value, type_="physical", style="slash"):
+    return {"attack": {"type": type_, "style": style, "value": value}}
+
+
+def _defense(value, weakness="slash"):
+    return {"defense": {"value": value, "weakness": weakness}}
+
+
+def _passive(name, trigger, cost, *effects):
+    return {"name": name, "trigger": trigger, "cost": cost, "effects": list(effects)}
+
+
+def _effect(type_, target, **payload):
+    return {"type": type_, "target": target, "payload": payload}
+
+
+def _character(name, attrs, hp, mana, equipment=None, type_="player"):
+    character = Character(name=name, type=type_, hp=hp, max_hp=hp, mana=mana, max_mana=mana, **attrs)
+    for slot, equip in (equipment or {}).items():
+        setattr(character, slot, equip)
+    return character
+
+
+def novice():
+    """Sem equipamentos nem passivas."""
+    return _character(
+        "Novato",
+        dict(strength=4, dexterity=4, arcane=2, constitution=4, courage=2, luck=2),
+        hp=100, mana=30,
+    )
+
+
+def warrior():
+    """Arma + armadura, com uma passiva de ataque que consome mana."""
+    return _character(
+        "Guerreiro",
+        dict(strength=10, dexterity=6, arcane=2, constitution=8, courage=5, luck=4),
+        hp=160, mana=40,
+        equipment={
+            "equipped_hands": make_equipment(
+                "Espada Longa", "hands", _attack(8), {"strength": 2},
+                _passive("Fúria", "on_attack", 2,
+                         _effect("attribute_mod", "self", attribute="strength", value=1, duration=2)),
+            ),
+            "equipped_head": make_equipment("Elmo", "head", _defense(3, "pierce"), {"constitution": 1}),
+            "equipped_chest": make_equipment("Peitoral", "chest", _defense(6, "blunt")),
+            "equipped_feet": make_equipment("Botas", "feet", _defense(2), {"dexterity": 1}),
+        },
+    )
+
+
+def mage():
+    """Dano mágico e passivas em vários triggers (início de turno e dano recebido)."""
+    return _character(
+        "Maga",
+        dict(strength=2, dexterity=5, arcane=12, constitution=5, courage=3, luck=6),
+        hp=110, mana=120,
+        equipment={
+            "equipped_hands": make_equipment(
+                "Cajado", "hands", _attack(7, "magical", "blunt"), {"arcane": 3},
+            ),
+            "equipped_necklace": make_equipment(
+                "Amuleto", "necklace", {}, {"arcane": 1},
+                _passive("Foco Arcano", "on_turn_start", 3,
+                         _effect("attribute_mod", "self", attribute="arcane", value=1, duration=1),
+                         _effect("status_effect", "enemy", status="burn", duration=2)),
+            ),
+            "equipped_shoulders": make_equipment(
+                "Manto", "shoulders", _defense(2, "slash"), {},
+                _passive("Espinhos", "on_receive_damage", 1,
+                         _effect("deal_damage", "enemy", damage=2)),
+            ),
+        },
+    )
+
+
+def knight():
+    """Todos os slots ocupados, com passivas em todos os itens que aceitam."""
+    return _character(
+        "Cavaleiro",
+        dict(strength=9, dexterity=5, arcane=4, constitution=12, courage=8, luck=3),
+        hp=220, mana=80,
+        equipment={
+            "equipped_hands": make_equipment("Lança", "hands", _attack(9, style="pierce"), {"strength": 1}),
+            "equipped_head": make_equipment(
+                "Elmo Fechado", "head", _defense(4), {"constitution": 1},
+                _passive("Vigília", "on_turn_start", 1,
+                         _effect("attribute_mod", "self", attribute="dexterity", value=1)),
+            ),
+            "equipped_necklace": make_equipment(
+                "Medalhão", "necklace", {}, {"courage": 2},
+                _passive("Bênção", "on_attack", 2,
+                         _effect("attribute_mod", "self", attribute="courage", value=1)),
+            ),
+            "equipped_shoulders": make_equipment("Ombreiras", "shoulders", _defense(3, "blunt")),
+            "equipped_chest": make_equipment(
+                "Armadura de Placas", "chest", _defense(9, "pierce"), {"constitution": 2},
+                _passive("Retaliação", "on_receive_damage", 2,
+                         _effect("deal_damage", "enemy", damage=3)),
+            ),
+            "equipped_feet": make_equipment(
+                "Grevas", "feet", _defense(3), {},
+                _passive("Firmeza", "on_defend", 1,
+                         _effect("attribute_mod", "self", attribute="constitution", value=1)),
+            ),
+        },
+    )
+
+
+def wolf():
+    return _character(
+        "Lobo",
+        dict(strength=7, dexterity=6, arcane=1, constitution=6, courage=2, luck=3),
+        hp=90, mana=0, type_="monster",
+    )
+
+
+def ogre():
+    return _character(
+        "Ogro",
+        dict(strength=14, dexterity=3, arcane=1, constitution=14, courage=6, luck=2),
+        hp=260, mana=0, type_="monster",
+    )
+
+
+CHARACTERS = {
+    "novice": novice,
+    "warrior": warrior,
+    "mage": mage,
+    "knight": knight,
+}
+
+MONSTERS = {
+    "wolf": wolf,
+    "ogre": ogre,
+}
+
+# (personagem, monstro) de cada cenário
+SCENARIOS = (
+    ("novice", "wolf"),
+    ("warrior", "wolf"),
+    ("mage", "ogre"),
+    ("knight", "ogre"),
+)
@@ -0,0 +1,240 @@
+# combat/benchmarks/runner.py
+"""
+Medição do motor de combate: batalhas por segundo, latência por chamada e
+alocações (``tracemalloc``) de ``run_battle``, ``compute_damage`` e
+``apply_effects_from_passives``.
+
+Os tempos e as alocações são medidos em rodadas separadas, porque o
+``tracemalloc`` deixa tudo bem mais lento. Qualquer consulta ao banco durante
+a medição levanta ``DatabaseAccessError``. Por padrão as medições rodam com o
+``LOGGING`` do projeto, como o jogo roda; ``quiet=True`` desliga DEBUG/INFO
+para isolar o custo do motor (o modo fica gravado em ``params["logging"]``).
+"""
+import gc
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from contextlib import ExitStack, contextmanager, nullcontext
+
+from django.db import connections
+from django.utils import timezone
+
+from ..adapters import combatant_from_model, run_battle
+from ..battle import compute_damage, apply_effects_from_passives
+from ..effects import ActiveEffects
+from ..engine import initialize_state, new_battle_state
+from ..events import ACTOR_CHARACTER, ACTOR_MONSTER
+from ..passives import compile_passives
+from .loadouts import CHARACTERS, MONSTERS, SCENARIOS
+
+RESULTS_VERSION = 1
+
+
+class DatabaseAccessError(RuntimeError):
+    pass
+
+
+def _block_queries(execute, sql, params, many, context):
+    raise DatabaseAccessError(f"Benchmark tentou acessar o banco: {sql}")
+
+
+@contextmanager
+def no_database():
+    """Falha na primeira consulta feita por qualquer conexão."""
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(_block_queries))
+        yield
+
+
+@contextmanager
+def quiet_logging(level=logging.INFO):
+    previous = logging.root.manager.disable
+    logging.disable(level)
+    try:
+        yield
+    finally:
+        logging.disable(previous)
+
+
+def _latency_stats(samples_ns):
+    samples = sorted(samples_ns)
+    total_s = sum(samples) / 1e9
+    return {
+        "calls": len(samples),
+        "calls_per_sec": len(samples) / total_s if total_s else 0.0,
+        "mean_us": statistics.fmean(samples) / 1e3,
+        "p50_us": samples[len(samples) // 2] / 1e3,
+        "p95_us": samples[min(len(samples) - 1, int(len(samples) * 0.95))] / 1e3,
+        "min_us": samples[0] / 1e3,
+    }
+
+
+def _time_each(fn, calls):
+    """Latência de cada chamada (para funções "grandes", como uma batalha inteira)."""
+    samples = []
+    clock = time.perf_counter_ns
+    for i in range(calls):
+        start = clock()
+        fn(i)
+        samples.append(clock() - start)
+    return _latency_stats(samples)
+
+
+def _time_batches(fn, calls, batch):
+    """
+    Latência média por chamada em lotes de ``batch`` chamadas (para funções
+    curtas, em que medir cada chamada custaria mais que a própria chamada).
+    """
+    samples = []
+    clock = time.perf_counter_ns
+    for _ in range(max(1, calls // batch)):
+        start = clock()
+        for i in range(batch):
+            fn(i)
+        samples.append((clock() - start) / batch)
+    stats = _latency_stats(samples)
+    stats["calls"] = len(samples) * batch
+    stats["calls_per_sec"] = 1e9 / statistics.fmean(samples)
+    return stats
+
+
+def _allocations(fn, calls):
+    """Bytes e blocos alocados (e ainda vivos ao final) por chamada, e o pico."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        for i in range(calls):
+            fn(i)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    diff = after.compare_to(before, "filename")
+    size = sum(stat.size_diff for stat in diff)
+    blocks = sum(stat.count_diff for stat in diff)
+    return {
+        "retained_bytes_per_call": size / calls,
+        "retained_blocks_per_call": blocks / calls,
+        "peak_bytes": peak,
+    }
+
+
+def _measure(fn, calls, batch=None):
+    for i in range(min(calls, 50)):  # aquecimento
+        fn(i)
+    timing = _time_batches(fn, calls, batch) if batch else _time_each(fn, calls)
+    timing.update(_allocations(fn, max(1, calls // 10)))
+    return timing
+
+
+def bench_run_battle(char_name, monster_name, battles, mode="full"):
+    character = CHARACTERS[char_name]()
+    monster = MONSTERS[monster_name]()
+
+    # run_battle não altera os modelos, então as mesmas instâncias servem para todas as batalhas
+    result = _measure(lambda i: run_battle(character, monster, seed=i, mode=mode), battles)
+    result["battles_per_sec"] = result.pop("calls_per_sec")
+    return result
+
+
+def _battle_states(char_name, monster_name):
+    character = combatant_from_model(CHARACTERS[char_name]())
+    monster = combatant_from_model(MONSTERS[monster_name]())
+    char_state = initialize_state(character, ACTOR_CHARACTER)
+    mon_state = initialize_state(monster, ACTOR_MONSTER)
+    battle_state = new_battle_state(0)
+    battle_state["turn"] = 1
+    return character, char_state, mon_state, battle_state
+
+
+def bench_compute_damage(char_name, monster_name, calls):
+    _, char_state, mon_state, battle_state = _battle_states(char_name, monster_name)
+    rng = battle_state["rng"]
+    attack_type = char_state["snapshot"].attack_type
+    return _measure(lambda i: compute_damage(char_state, mon_state, attack_type, rng), calls, batch=1000)
+
+
+def bench_apply_effects(char_name, monster_name, calls, trigger):
+    character, char_state, mon_state, battle_state = _battle_states(char_name, monster_name)
+    compiled = compile_passives(character.passives)
+
+    def call(i):
+        # volta ao estado inicial para a mana/buffs não se acumularem entre as chamadas
+        if not i % 1000:
+            battle_state["effects"] = ActiveEffects()
+            char_state["mana"] = 10 ** 9
+            char_state["_temp_attrs"] = {}
+            char_state["_secondary"] = None
+            char_state["statuses"] = {}
+            mon_state["statuses"] = {}
+            mon_state["hp"] = 10 ** 9
+            battle_state["events"] = []
+        apply_effects_from_passives(compiled, trigger, char_state, mon_state, battle_state)
+
+    result = _measure(call, calls, batch=1000)
+    result["passives"] = len(compiled.get(trigger, ()))
+    return result
+
+
+def run_benchmarks(battles=500, calls=50000, scenarios=SCENARIOS, quiet=False):
+    """Roda todos os benchmarks e devolve um dicionário pronto para ``json.dump``."""
+    results = {}
+    with no_database(), quiet_logging() if quiet else nullcontext():
+        for char_name, monster_name in scenarios:
+            scenario = f"{char_name}_vs_{monster_name}"
+            for mode in ("full", "summary"):
+                results[f"run_battle[{mode}]:{scenario}"] = bench_run_battle(
+                    char_name, monster_name, battles, mode,
+                )
+            results[f"compute_damage:{scenario}"] = bench_compute_damage(char_name, monster_name, calls)
+
+            for trigger in ("on_turn_start", "on_attack", "on_receive_damage"):
+                results[f"apply_effects[{trigger}]:{char_name}"] = bench_apply_effects(
+                    char_name, monster_name, calls, trigger,
+                )
+
+    return {
+        "version": RESULTS_VERSION,
+        "created_at": timezone.now().isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "params": {"battles": battles, "calls": calls, "logging": "muted" if quiet else "project"},
+        "results": results,
+    }
+
+
+# métrica principal de cada resultado na comparação (maior = melhor)
+def _headline(result):
+    return result.get("battles_per_sec") or result.get("calls_per_sec") or 0.0
+
+
+def compare_results(current, baseline):
+    """
+    Variação percentual de vazão (batalhas/chamadas por segundo) entre duas
+    execuções. Positivo = mais rápido que o ``baseline``.
+    """
+    changes = {}
+    for name, result in current["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if not old or not _headline(old):
+            continue
+        changes[name] = (_headline(result) / _headline(old) - 1) * 100
+    return changes
+
+
+def write_results(data, path):
+    with open(path, "w", encoding="utf-8") as fp:
+        json.dump(data, fp, indent=2, ensure_ascii=False)
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as fp:
+        return json.load(fp)
@@ -0,0 +1,100 @@
+# combat/effects.py
+"""
+Efeitos ativos de uma batalha (buffs/debuffs de atributo e status).
+
+Cada efeito com duração entra num min-heap pela rodada em que expira; no
+início de cada rodada só os efeitos vencidos saem do heap (O(log n) cada) e
+desfazem a sua parte em ``_temp_attrs``. Aplicar ou remover um efeito toca
+apenas o atributo afetado (e marca os secundários do combatente para
+recálculo), então o custo da rodada não cresce com buffs acumulados.
+
+Um efeito aplicado na rodada ``t`` com ``duration=d`` vale até o fim da rodada
+``t + d - 1`` e sai no início da rodada ``t + d``. Status de dano por rodada
+(queimadura, veneno, sangramento) causam dano no início de cada uma das ``d``
+rodadas seguintes (``t + 1`` a ``t + d``), inclusive na rodada em que saem:
+o dano vem antes da expiração, então ``duration=1`` ainda causa dano uma vez.
+"""
+import heapq
+
+from .events import BattleEvent, EVENT_STATUS_DAMAGE
+
+# dano por rodada de cada status (o payload pode trocar com "damage")
+STATUS_DAMAGE = {
+    "burn": 2,
+    "poison": 1,
+    "bleed": 1,
+}
+
+_MODIFIER = 0
+_STATUS = 1
+
+
+class ActiveEffects:
+    __slots__ = ("_heap", "_seq", "_ticking")
+
+    def __init__(self):
+        self._heap = []       # (rodada em que expira, seq, tipo, estado, dados)
+        self._seq = 0
+        self._ticking = {}    # seq -> (estado, dano, ator de origem, ref da passiva) dos status com dano
+
+    def __len__(self):
+        return len(self._heap)
+
+    def _push(self, expires, kind, state, data):
+        self._seq += 1
+        heapq.heappush(self._heap, (expires, self._seq, kind, state, data))
+        return self._seq
+
+    def add_modifier(self, state, attr, value, turn, duration):
+        """Soma ``value`` em ``attr`` do combatente por ``duration`` rodadas (``None`` = a luta toda)."""
+        temp_attrs = state["_temp_attrs"]
+        temp_attrs[attr] = temp_attrs.get(attr, 0) + value
+        state["_secondary"] = None
+        if duration is not None:
+            self._push(turn + max(1, duration), _MODIFIER, state, (attr, value))
+
+    def add_status(self, state, status, turn, duration, damage=0, source_actor=0, ref=0):
+        """
+        Marca ``status`` no combatente por ``duration`` rodadas (``None`` = a luta toda).
+        Com ``damage``, causa esse dano no início de cada rodada (evento em nome de
+        ``source_actor``/``ref``).
+        """
+        statuses = state["statuses"]
+        statuses[status] = statuses.get(status, 0) + 1
+        if duration is None:
+            self._seq += 1  # nunca sai do heap, só precisa de uma chave em _ticking
+            seq = self._seq
+        else:
+            seq = self._push(turn + max(1, duration), _STATUS, state, status)
+        if damage:
+            self._ticking[seq] = (state, damage, source_actor, ref)
+
+    def start_turn(self, turn, events=None):
+        """
+        Aplica o dano dos status ativos e DEPOIS remove os efeitos que vencem
+        em ``turn`` (um status com dano vencendo agora ainda causa o último dano).
+        """
+        for state, damage, source_actor, ref in self._ticking.values():
+            state["hp"] -= damage
+            if events is not None:
+                events.append(BattleEvent(turn, source_actor, EVENT_STATUS_DAMAGE, damage, False, ref))
+
+        heap = self._heap
+        while heap and heap[0][0] <= turn:
+            _, seq, kind, state, data = heapq.heappop(heap)
+            if kind == _MODIFIER:
+                attr, value = data
+                temp_attrs = state["_temp_attrs"]
+                remaining = temp_attrs.get(attr, 0) - value
+                if remaining:
+                    temp_attrs[attr] = remaining
+                else:
+                    # sem modificadores, compute_final_attrs volta a usar o snapshot direto
+                    temp_attrs.pop(attr, None)
+                state["_secondary"] = None
+            else:
+                statuses = state["statuses"]
+                statuses[data] -= 1
+                if not statuses[data]:
+                    del statuses[data]
+                self._ticking.pop(seq, None)
@@ -1,111 +1,196 @@
 # combat/engine.py
-from django.utils import timezone
-from items.models import EquipmentSlot
-from .battle import (
-    compute_hit_chance, compute_damage, apply_effects_from_passives,
-    safe_get_equipment_passives, roll_chance, group_battle_log_by_turns
+"""
+Núcleo do combate, sem Django: recebe dois ``Combatant`` e devolve um
+``BattleResult``. Tudo aqui é Python puro e picklable, então batalhas podem
+rodar em processos separados. A conversão de/para os modelos fica em
+``combat/adapters.py``.
+"""
+import hashlib
+import json
+import random
+import secrets
+
+from .battle import compute_hit_chance, compute_damage, apply_effects_from_passives, roll_chance
+from .effects import ActiveEffects
+from .events import (
+    BattleEvent, ACTOR_CHARACTER, ACTOR_MONSTER, EVENT_HIT, EVENT_MISS, EVENT_DEATH, EVENT_TURN_LIMIT,
 )
+from .passives import compile_passives
 
 MAX_TURNS = 50
 
 
-def build_passives_from_equipment(owner):
-    passives = []
-    for slot in (
-        "equipped_head", "equipped_necklace", "equipped_shoulders",
-        "equipped_chest", "equipped_hands", "equipped_feet"
-    ):
-        eq = getattr(owner, slot, None)
-        if eq:
-            passives += safe_get_equipment_passives(eq)
-    return passives
+def initialize_state(combatant, actor):
+    return {
+        "actor": actor,
+        "snapshot": combatant.snapshot,
+        "hp": combatant.hp,
+        "mana": combatant.mana,
+        "_temp_attrs": {},
+        "_secondary": combatant.snapshot.secondary,  # cache de compute_state_secondary_stats
+        "statuses": {},   # status ativo -> quantas aplicações
+    }
 
 
-def initialize_state(entity):
+def new_battle_state(seed, events=True):
     return {
-        "obj": entity,
-        "hp": entity.hp,
-        "_temp_attrs": {},
-        "weakness": getattr(entity, "weakness", 1.0),
+        "turn": 0,
+        "winner": None,
+        "rng": random.Random(seed),
+        "events": [] if events else None,
+        "effects": ActiveEffects(),
     }
 
 
+def check_turn_start_deaths(t, char_state, mon_state, battle_state):
+    """
+    Status e passivas de início de turno podem matar antes de qualquer ataque.
+    Retorna ``True`` se a batalha acabou.
+    """
+    if mon_state["hp"] <= 0:
+        battle_state["winner"] = "character"
+        dead = ACTOR_MONSTER
+    elif char_state["hp"] <= 0:
+        battle_state["winner"] = "monster"
+        dead = ACTOR_CHARACTER
+    else:
+        return False
+
+    if battle_state["events"] is not None:
+        battle_state["events"].append(BattleEvent(t, dead, EVENT_DEATH))
+    return True
+
+
+def combatants_hash(char_state, char_passives, mon_state, mon_passives):
+    """
+    Hash dos atributos de combate dos dois lados. Se o hash não bater, os
+    combatentes mudaram (equipamentos/atributos) e o seed não reproduz mais a luta.
+    """
+    payload = json.dumps(
+        [char_state["snapshot"].key(), char_passives, mon_state["snapshot"].key(), mon_passives],
+        sort_keys=True, default=str,
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
 def run_turn(
     t, char_state, mon_state, char_passives, mon_passives,
-    char_atk, monster_atk_type, battle_log, battle_stats, battle_state
+    char_atk_type, monster_atk_type, battle_stats, battle_state
 ):
-    battle_log.append(f"--- Turno {t} ---")
+    rng = battle_state["rng"]
+    events = battle_state["events"]
+
+    # STATUS / EFEITOS QUE VENCEM
+    battle_state["effects"].start_turn(t, events)
 
     # PASSIVES ON TURN START
     apply_effects_from_passives(char_passives, "on_turn_start",
-                                char_state, mon_state, battle_state, battle_log)
+                                char_state, mon_state, battle_state)
     apply_effects_from_passives(mon_passives, "on_turn_start",
-                                mon_state, char_state, battle_state, battle_log)
+                                mon_state, char_state, battle_state)
 
-    character = char_state["obj"]
-    monster = mon_state["obj"]
+    if check_turn_start_deaths(t, char_state, mon_state, battle_state):
+        return
 
     # CHARACTER ATTACKS
-    hit_chance = compute_hit_chance(character, monster)
-    if roll_chance(hit_chance):
-        damage, crit = compute_damage(char_state, mon_state, char_atk.type)
+    hit_chance = compute_hit_chance(char_state["snapshot"], mon_state["snapshot"])
+    if roll_chance(hit_chance, rng):
+        damage, crit = compute_damage(char_state, mon_state, char_atk_type, rng)
         apply_effects_from_passives(char_passives, "on_attack",
-                                    char_state, mon_state, battle_state, battle_log)
+                                    char_state, mon_state, battle_state)
 
         mon_state["hp"] -= damage
         battle_stats["hits"] += 1
         if crit:
             battle_stats["crits"] += 1
         battle_stats["total_damage_dealt"] += damage
-
-        battle_log.append(
-            f"{character.name} acerta {damage} dano "
-            f"{'(CRÍTICO)' if crit else ''} em {monster.name} "
-            f"(hp restante: {max(0, mon_state['hp'])})."
-        )
+        events.append(BattleEvent(t, ACTOR_CHARACTER, EVENT_HIT, damage, crit))
 
         apply_effects_from_passives(mon_passives, "on_receive_damage",
-                                    mon_state, char_state, battle_state, battle_log)
+                                    mon_state, char_state, battle_state)
     else:
         battle_stats["misses"] += 1
-        battle_log.append(f"{character.name} errou o ataque em {monster.name}.")
+        events.append(BattleEvent(t, ACTOR_CHARACTER, EVENT_MISS))
 
     if mon_state["hp"] <= 0:
         battle_state["winner"] = "character"
-        battle_log.append(f"{monster.name} morreu!")
+        events.append(BattleEvent(t, ACTOR_MONSTER, EVENT_DEATH))
         return
 
     # MONSTER ATTACKS
-    hit_chance_m = compute_hit_chance(monster, character)
-    if roll_chance(hit_chance_m):
-        damage_m, crit_m = compute_damage(mon_state, char_state, monster_atk_type)
+    hit_chance_m = compute_hit_chance(mon_state["snapshot"], char_state["snapshot"])
+    if roll_chance(hit_chance_m, rng):
+        damage_m, crit_m = compute_damage(mon_state, char_state, monster_atk_type, rng)
         apply_effects_from_passives(mon_passives, "on_attack",
-                                    mon_state, char_state, battle_state, battle_log)
+                                    mon_state, char_state, battle_state)
 
         char_state["hp"] -= damage_m
         battle_stats["total_damage_taken"] += damage_m
-
-        battle_log.append(
-            f"{monster.name} acerta {damage_m} dano "
-            f"{'(CRÍTICO)' if crit_m else ''} em {character.name} "
-            f"(hp restante: {max(0, char_state['hp'])})."
-        )
+        events.append(BattleEvent(t, ACTOR_MONSTER, EVENT_HIT, damage_m, crit_m))
 
         apply_effects_from_passives(char_passives, "on_receive_damage",
-                                    char_state, mon_state, battle_state, battle_log)
+                                    char_state, mon_state, battle_state)
     else:
-        battle_log.append(f"{monster.name} errou o ataque em {character.name}.")
+        events.append(BattleEvent(t, ACTOR_MONSTER, EVENT_MISS))
 
     if char_state["hp"] <= 0:
         battle_state["winner"] = "monster"
-        battle_log.append(f"{character.name} foi derrotado!")
+        events.append(BattleEvent(t, ACTOR_CHARACTER, EVENT_DEATH))
         return
 
 
-def finalize_battle(character, monster, battle_log, battle_state, char_state):
+def run_summary_turns(
+    char_state, mon_state, char_passives, mon_passives,
+    char_atk_type, monster_atk_type, battle_state
+):
+    """
+    Mesmas regras de ``run_turn`` para todos os turnos, sem eventos nem
+    estatísticas por turno. Consome o RNG na mesma ordem, então o resultado é
+    idêntico ao modo completo com o mesmo seed.
+    """
+    rng = battle_state["rng"]
+    char_hit_chance = compute_hit_chance(char_state["snapshot"], mon_state["snapshot"])
+    mon_hit_chance = compute_hit_chance(mon_state["snapshot"], char_state["snapshot"])
+    damage_dealt = 0
+    damage_taken = 0
+
+    for t in range(1, MAX_TURNS + 1):
+        battle_state["turn"] = t
+        battle_state["effects"].start_turn(t)
+
+        apply_effects_from_passives(char_passives, "on_turn_start", char_state, mon_state, battle_state)
+        apply_effects_from_passives(mon_passives, "on_turn_start", mon_state, char_state, battle_state)
+
+        if check_turn_start_deaths(t, char_state, mon_state, battle_state):
+            break
+
+        if roll_chance(char_hit_chance, rng):
+            damage, _ = compute_damage(char_state, mon_state, char_atk_type, rng)
+            apply_effects_from_passives(char_passives, "on_attack", char_state, mon_state, battle_state)
+            mon_state["hp"] -= damage
+            damage_dealt += damage
+            apply_effects_from_passives(mon_passives, "on_receive_damage", mon_state, char_state, battle_state)
+
+        if mon_state["hp"] <= 0:
+            battle_state["winner"] = "character"
+            break
+
+        if roll_chance(mon_hit_chance, rng):
+            damage, _ = compute_damage(mon_state, char_state, monster_atk_type, rng)
+            apply_effects_from_passives(mon_passives, "on_attack", mon_state, char_state, battle_state)
+            char_state["hp"] -= damage
+            damage_taken += damage
+            apply_effects_from_passives(char_passives, "on_receive_damage", char_state, mon_state, battle_state)
+
+        if char_state["hp"] <= 0:
+            battle_state["winner"] = "monster"
+            break
+
+    return damage_dealt, damage_taken
+
+
+def finalize_battle(battle_state):
     winner = battle_state["winner"]
-    character.hp = max(0, int(char_state["hp"]))
-    character.save()
     if winner == "character":
         return "character"
 
@@ -113,21 +198,90 @@ def finalize_battle(character, monster, battle_log, battle_state, char_state):
         return "monster"
 
     else:
-        battle_log.append("Combate terminou por limite de turnos.")
+        if battle_state["events"] is not None:
+            battle_state["events"].append(
+                BattleEvent(battle_state["turn"], ACTOR_CHARACTER, EVENT_TURN_LIMIT)
+            )
         return "draw"
 
 
-def run_battle(character, monster):
-    """Executa TODO o combate e retorna um dicionário com tudo que a view precisa."""
-    battle_log = []
-    battle_state = {
-        "start_time": timezone.now(),
-        "turn": 0,
-        "winner": None,
+class BattleResult:
+    """
+    Resultado de ``run_combat``. ``events``, ``battle_stats`` e
+    ``snapshot_hash`` ficam ``None`` no modo "summary".
+    """
+
+    __slots__ = (
+        "winner", "turns", "seed",
+        "char_hp", "char_mana", "mon_hp", "mon_mana",
+        "damage_dealt", "damage_taken",
+        "initial", "events", "battle_stats", "snapshot_hash",
+    )
+
+    def __init__(self, winner, turns, seed, char_state, mon_state, damage_dealt, damage_taken,
+                 initial, events=None, battle_stats=None, snapshot_hash=None):
+        self.winner = winner
+        self.turns = turns
+        self.seed = seed
+        self.char_hp = char_state["hp"]
+        self.char_mana = char_state["mana"]
+        self.mon_hp = mon_state["hp"]
+        self.mon_mana = mon_state["mana"]
+        self.damage_dealt = damage_dealt
+        self.damage_taken = damage_taken
+        self.initial = initial
+        self.events = events
+        self.battle_stats = battle_stats
+        self.snapshot_hash = snapshot_hash
+
+
+def new_battle_seed():
+    return secrets.randbits(63)
+
+
+def run_combat(character, monster, seed=None, mode="full", monster_atk_type="physical"):
+    """
+    Executa TODO o combate entre dois ``Combatant`` e retorna um ``BattleResult``.
+
+    ``mode="summary"`` é para processamento em lote (caçadas expiradas,
+    simulações de arena, balanceamento): não monta eventos nem estatísticas
+    por turno e retorna apenas vencedor, turnos, dano total e hp/mana finais.
+
+    Cada batalha usa seu próprio ``random.Random(seed)``: com o mesmo seed e os
+    mesmos combatentes o combate é reproduzido exatamente.
+    """
+    if mode not in ("full", "summary"):
+        raise ValueError(f"Modo de batalha inválido: {mode}")
+    if seed is None:
+        seed = new_battle_seed()
+
+    summary = mode == "summary"
+    battle_state = new_battle_state(seed, events=not summary)
+
+    initial = {
+        "char_hp": character.hp,
+        "char_mana": character.mana,
+        "mon_hp": monster.hp,
+        "mon_mana": monster.mana,
     }
 
-    char_state = initialize_state(character)
-    mon_state = initialize_state(monster)
+    char_state = initialize_state(character, ACTOR_CHARACTER)
+    mon_state = initialize_state(monster, ACTOR_MONSTER)
+
+    char_compiled = compile_passives(character.passives)
+    mon_compiled = compile_passives(monster.passives)
+
+    char_atk_type = character.snapshot.attack_type
+
+    if summary:
+        damage_dealt, damage_taken = run_summary_turns(
+            char_state, mon_state, char_compiled, mon_compiled,
+            char_atk_type, monster_atk_type, battle_state,
+        )
+        return BattleResult(
+            finalize_battle(battle_state), battle_state["turn"], seed,
+            char_state, mon_state, damage_dealt, damage_taken, initial,
+        )
 
     battle_stats = {
         "total_damage_dealt": 0,
@@ -138,32 +292,26 @@ def run_battle(character, monster):
         "turns_taken": 0
     }
 
-    char_passives = build_passives_from_equipment(character)
-    mon_passives = []  # seus monstros mock não têm passivas por enquanto
-
-    char_atk = character.equipped_hands.parsed_stats.attack
-    monster_atk_type = "physical"
-
     for t in range(1, MAX_TURNS + 1):
         battle_state["turn"] = t
         run_turn(
-            t, char_state, mon_state, char_passives, mon_passives,
-            char_atk, monster_atk_type,
-            battle_log, battle_stats, battle_state
+            t, char_state, mon_state, char_compiled, mon_compiled,
+            char_atk_type, monster_atk_type,
+            battle_stats, battle_state
         )
 
         if battle_state["winner"] is not None:
             break
 
     battle_stats["turns_taken"] = battle_state["turn"]
-    final_winner = finalize_battle(character, monster, battle_log, battle_state, char_state)
-
-    return {
-        "battle_log": battle_log,
-        "winner": final_winner,
-        "monster": monster,
-        "character": character,
-        "battle_stats": battle_stats,
-        "char_state": char_state,
-        "mon_state": mon_state,
-    }
+    final_winner = finalize_battle(battle_state)
+
+    return BattleResult(
+        final_winner, battle_state["turn"], seed,
+        char_state, mon_state,
+        battle_stats["total_damage_dealt"], battle_stats["total_damage_taken"],
+        initial,
+        events=battle_state["events"],
+        battle_stats=battle_stats,
+        snapshot_hash=combatants_hash(char_state, character.passives, mon_state, monster.passives),
+    )
@@ -0,0 +1,120 @@
+# combat/events.py
+"""
+Eventos compactos de batalha e sua codificação binária.
+
+O motor de combate não gera texto: cada acontecimento vira um ``BattleEvent``
+``(turn, actor, kind, amount, crit, ref)``. O texto só é montado quando o log
+é exibido (ver combat/log.py).
+
+No formato binário cada evento ocupa 5 bytes: turno, um byte com
+ator/crítico/tipo, o valor (int16) e a referência da passiva.
+"""
+import struct
+from typing import NamedTuple
+
+ACTOR_CHARACTER = 0
+ACTOR_MONSTER = 1
+
+EVENT_HIT = 1             # amount = dano
+EVENT_MISS = 2
+EVENT_DEATH = 3           # actor = quem morreu
+EVENT_PASSIVE_NO_MANA = 4
+EVENT_ATTRIBUTE_MOD = 5   # amount = valor aplicado
+EVENT_STATUS = 6          # amount = duração (0 = até o fim da luta)
+EVENT_PASSIVE_DAMAGE = 7  # amount = dano
+EVENT_TURN_LIMIT = 8
+EVENT_STATUS_DAMAGE = 9   # amount = dano do status no início do turno
+
+
+class BattleEvent(NamedTuple):
+    turn: int
+    actor: int
+    kind: int
+    amount: int = 0
+    crit: bool = False
+    # eventos de passiva: (índice da passiva << 4) | índice do efeito
+    ref: int = 0
+
+
+# a ref ocupa um byte: até 16 passivas por combatente e 16 efeitos por passiva
+MAX_PASSIVES = 16
+MAX_PASSIVE_EFFECTS = 16
+
+
+def passive_ref(passive_index, effect_index=0):
+    if not (0 <= passive_index < MAX_PASSIVES and 0 <= effect_index < MAX_PASSIVE_EFFECTS):
+        raise ValueError(f"Referência de passiva fora do limite: ({passive_index}, {effect_index})")
+    return (passive_index << 4) | effect_index
+
+
+def split_passive_ref(ref):
+    return ref >> 4, ref & 0x0F
+
+
+FORMAT_VERSION = 2
+
+_HEADER = struct.Struct("<BHHHH")  # versão, hp e mana iniciais dos dois combatentes
+_EVENT_V1 = struct.Struct("<BBH")
+_EVENT = struct.Struct("<BBhB")
+
+_CRIT_FLAG = 0x80
+_ACTOR_FLAG = 0x40
+_KIND_MASK = 0x3F
+
+
+def _clamp(value, low=0, high=0xFFFF):
+    return max(low, min(int(value), high))
+
+
+def encode_events(events, char_hp, char_mana, mon_hp, mon_mana):
+    """Codifica a lista de eventos (e o estado inicial da batalha) em bytes."""
+    buffer = bytearray(_HEADER.size + _EVENT.size * len(events))
+    _HEADER.pack_into(
+        buffer, 0, FORMAT_VERSION,
+        _clamp(char_hp), _clamp(char_mana), _clamp(mon_hp), _clamp(mon_mana),
+    )
+
+    offset = _HEADER.size
+    for turn, actor, kind, amount, crit, ref in events:
+        if not 0 <= ref <= 0xFF:
+            raise ValueError(f"Referência de passiva fora do limite: {ref}")
+        flags = kind & _KIND_MASK
+        if actor == ACTOR_MONSTER:
+            flags |= _ACTOR_FLAG
+        if crit:
+            flags |= _CRIT_FLAG
+        _EVENT.pack_into(buffer, offset, turn, flags, _clamp(amount, -0x8000, 0x7FFF), ref)
+        offset += _EVENT.size
+
+    return bytes(buffer)
+
+
+def decode_events(data):
+    """
+    Inverso de ``encode_events``.
+    Retorna ``(initial, events)``, onde ``initial`` tem hp/mana iniciais.
+    """
+    data = bytes(data)
+    version, char_hp, char_mana, mon_hp, mon_mana = _HEADER.unpack_from(data, 0)
+
+    initial = {
+        "char_hp": char_hp,
+        "char_mana": char_mana,
+        "mon_hp": mon_hp,
+        "mon_mana": mon_mana,
+    }
+
+    body = data[_HEADER.size:]
+    if version == 1:
+        rows = ((turn, flags, amount, 0) for turn, flags, amount in _EVENT_V1.iter_unpack(body))
+    elif version == FORMAT_VERSION:
+        rows = _EVENT.iter_unpack(body)
+    else:
+        raise ValueError(f"Versão de eventos desconhecida: {version}")
+
+    events = []
+    for turn, flags, amount, ref in rows:
+        actor = ACTOR_MONSTER if flags & _ACTOR_FLAG else ACTOR_CHARACTER
+        events.append(BattleEvent(turn, actor, flags & _KIND_MASK, amount, bool(flags & _CRIT_FLAG), ref))
+
+    return initial, events
@@ -0,0 +1,193 @@
+# combat/group.py
+"""
+Combates em grupo (N x M): grupos de personagens contra bandos de monstros.
+
+A ordem de ação vem de uma fila de prioridade (heap) com entradas
+``(turno, -velocidade, lado, índice)``: em cada turno todos os vivos agem uma
+vez, do mais rápido para o mais lento (velocidade = destreza final). Quem
+morre sai da fila de forma preguiçosa (a entrada é descartada quando sai do
+heap), e o alvo é sorteado entre os vivos do outro lado em O(1). Cada ação
+custa O(log n), então a batalha escala linearmente com o número de
+combatentes.
+
+As regras de acerto, dano e passivas são as mesmas do 1x1. O 1x1 continua no
+caminho dedicado (``run_combat``), sem custo extra, e é convertido para o
+mesmo formato de resultado.
+
+Por enquanto só existe o modo resumo: não há eventos/log por golpe.
+"""
+import heapq
+
+from .battle import compute_hit_chance, compute_damage, apply_effects_from_passives, roll_chance
+from .engine import MAX_TURNS, initialize_state, new_battle_seed, new_battle_state, run_combat
+from .passives import compile_passives
+
+SIDE_PARTY = 0
+SIDE_ENEMIES = 1
+
+WINNERS = {SIDE_PARTY: "party", SIDE_ENEMIES: "enemies"}
+
+
+class GroupBattleResult:
+    """
+    Resultado de ``run_group_combat``. ``party``/``enemies`` têm ``(hp, mana)``
+    finais de cada combatente, na ordem recebida; ``deaths`` tem
+    ``(turno, lado, índice)`` na ordem em que caíram.
+    """
+
+    __slots__ = ("winner", "turns", "seed", "party", "enemies", "damage_dealt", "damage_taken", "deaths")
+
+    def __init__(self, winner, turns, seed, party, enemies, damage_dealt, damage_taken, deaths):
+        self.winner = winner
+        self.turns = turns
+        self.seed = seed
+        self.party = party
+        self.enemies = enemies
+        self.damage_dealt = damage_dealt
+        self.damage_taken = damage_taken
+        self.deaths = deaths
+
+
+class AliveSet:
+    """Índices vivos de um lado: sorteio e remoção em O(1) (troca com o último)."""
+
+    __slots__ = ("_items", "_positions")
+
+    def __init__(self, size):
+        self._items = list(range(size))
+        self._positions = {index: index for index in self._items}
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, index):
+        return index in self._positions
+
+    def choice(self, rng):
+        return self._items[int(rng.random() * len(self._items))]
+
+    def remove(self, index):
+        position = self._positions.pop(index)
+        last = self._items.pop()
+        if last != index:
+            self._items[position] = last
+            self._positions[last] = position
+
+
+def speed(snapshot):
+    return snapshot.attrs.get("dexterity", 1)
+
+
+def _from_duel(battle):
+    winner = {"character": "party", "monster": "enemies"}.get(battle.winner, "draw")
+    deaths = []
+    if battle.winner == "character":
+        deaths.append((battle.turns, SIDE_ENEMIES, 0))
+    elif battle.winner == "monster":
+        deaths.append((battle.turns, SIDE_PARTY, 0))
+    return GroupBattleResult(
+        winner, battle.turns, battle.seed,
+        [(battle.char_hp, battle.char_mana)], [(battle.mon_hp, battle.mon_mana)],
+        battle.damage_dealt, battle.damage_taken, deaths,
+    )
+
+
+def run_group_combat(party, enemies, seed=None, enemy_atk_type="physical"):
+    """
+    Executa um combate entre duas listas de ``Combatant`` e retorna um
+    ``GroupBattleResult``. ``winner`` é "party", "enemies" ou "draw".
+    """
+    if not party or not enemies:
+        raise ValueError("Os dois lados precisam de pelo menos um combatente.")
+    if seed is None:
+        seed = new_battle_seed()
+
+    if len(party) == 1 and len(enemies) == 1:
+        return _from_duel(run_combat(party[0], enemies[0], seed=seed, mode="summary", monster_atk_type=enemy_atk_type))
+
+    battle_state = new_battle_state(seed, events=False)
+    rng = battle_state["rng"]
+    effects = battle_state["effects"]
+
+    combatants = (party, enemies)
+    states = tuple(
+        [initialize_state(combatant, side) for combatant in side_combatants]
+        for side, side_combatants in enumerate(combatants)
+    )
+    compiled = tuple([compile_passives(c.passives) for c in side_combatants] for side_combatants in combatants)
+    attack_types = (
+        [c.snapshot.attack_type for c in party],
+        [enemy_atk_type] * len(enemies),
+    )
+    alive = (AliveSet(len(party)), AliveSet(len(enemies)))
+
+    queue = [
+        (1, -speed(combatant.snapshot), side, index)
+        for side, side_combatants in enumerate(combatants)
+        for index, combatant in enumerate(side_combatants)
+    ]
+    heapq.heapify(queue)
+
+    damage = [0, 0]  # dano causado por cada lado
+    deaths = []
+
+    def check_death(side, index):
+        if states[side][index]["hp"] <= 0 and index in alive[side]:
+            alive[side].remove(index)
+            deaths.append((battle_state["turn"], side, index))
+            if not alive[side]:
+                battle_state["winner"] = WINNERS[1 - side]
+
+    while queue:
+        turn, neg_speed, side, index = heapq.heappop(queue)
+        if turn > MAX_TURNS:
+            break
+        if index not in alive[side]:
+            continue  # morreu: sai da fila
+
+        if turn != battle_state["turn"]:
+            battle_state["turn"] = turn
+            effects.start_turn(turn)
+            for s, side_states in enumerate(states):
+                for i in range(len(side_states)):
+                    check_death(s, i)
+            if battle_state["winner"] is not None:
+                break
+            if index not in alive[side]:
+                continue
+        other = 1 - side
+        target_index = alive[other].choice(rng)
+        state = states[side][index]
+        target = states[other][target_index]
+        passives = compiled[side][index]
+        target_passives = compiled[other][target_index]
+
+        apply_effects_from_passives(passives, "on_turn_start", state, target, battle_state)
+        check_death(side, index)
+        check_death(other, target_index)
+
+        if index in alive[side] and target_index in alive[other]:
+            if roll_chance(compute_hit_chance(state["snapshot"], target["snapshot"]), rng):
+                dmg, _ = compute_damage(state, target, attack_types[side][index], rng)
+                apply_effects_from_passives(passives, "on_attack", state, target, battle_state)
+                target["hp"] -= dmg
+                damage[side] += dmg
+                apply_effects_from_passives(target_passives, "on_receive_damage", target, state, battle_state)
+                check_death(other, target_index)
+                check_death(side, index)
+
+        if battle_state["winner"] is not None:
+            break
+        if index in alive[side]:
+            heapq.heappush(queue, (turn + 1, neg_speed, side, index))
+
+    return GroupBattleResult(
+        battle_state["winner"] or "draw",
+        battle_state["turn"],
+        seed,
+        [(s["hp"], s["mana"]) for s in states[SIDE_PARTY]],
+        [(s["hp"], s["mana"]) for s in states[SIDE_ENEMIES]],
+        damage[SIDE_PARTY],
+        damage[SIDE_ENEMIES],
+        deaths,
+    )
@@ -0,0 +1,177 @@
+# combat/leaderboard.py
+"""
+Leaderboard da arena em memória (por processo).
+
+Guarda todos os participantes numa lista ordenada por ``(-points, character_id)``:
+o top-N é uma fatia da lista e a posição de um jogador sai por busca binária,
+sem consultar o banco. As mudanças de pontos chegam pelos sinais de
+``ArenaRanking`` (combat/signals.py) e são aplicadas uma a uma.
+
+Os processos se sincronizam por um log de mudanças no banco
+(``LeaderboardChange``): quem muda pontos, nome ou remove alguém grava uma
+linha com o valor novo, e cada processo lê, no máximo a cada
+``check_interval`` segundos, só as linhas mais novas que a sua geração (o id
+da última linha aplicada), aplicando-as na lista em ordem. As linhas são
+gravadas depois do commit, em autocommit. ``manage.py rebuild_leaderboard``
+grava um pedido de recarga completa. Por segurança a lista também é
+recarregada a cada ``max_age`` segundos, e cada recarga apaga do log o que
+passou de ``CHANGE_LOG_KEEP`` linhas; um processo mais atrasado que isso
+recarrega tudo.
+"""
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import NamedTuple
+
+from .models import ArenaRanking, LeaderboardChange
+
+CHANGE_LOG_KEEP = 10_000
+
+
+def latest_generation():
+    return LeaderboardChange.objects.order_by("-pk").values_list("pk", flat=True).first() or 0
+
+
+class LeaderboardEntry(NamedTuple):
+    rank: int
+    character_id: int
+    points: int
+    name: str
+    emoji: str
+
+
+class Leaderboard:
+    def __init__(self, max_age=300, check_interval=2):
+        self.max_age = max_age
+        self.check_interval = check_interval
+        self._keys = []     # ordenada: (-points, character_id)
+        self._points = {}   # character_id -> points
+        self._names = {}    # character_id -> (name, emoji)
+        self._loaded_at = None
+        self._checked_at = None
+        self._generation = None
+        self._lock = threading.RLock()
+
+    def rebuild(self):
+        generation = latest_generation()
+        rows = ArenaRanking.objects.filter(character__type="player").values_list(
+            "character_id", "points", "character__name", "character__emoji",
+        )
+        with self._lock:
+            self._points = {}
+            self._names = {}
+            for character_id, points, name, emoji in rows:
+                self._points[character_id] = points
+                self._names[character_id] = (name, emoji)
+            self._keys = sorted((-points, character_id) for character_id, points in self._points.items())
+            self._loaded_at = self._checked_at = time.monotonic()
+            self._generation = generation
+        LeaderboardChange.objects.filter(pk__lte=generation - CHANGE_LOG_KEEP).delete()
+
+    def request_rebuild(self):
+        """Faz TODOS os processos recarregarem o leaderboard na próxima leitura."""
+        LeaderboardChange.objects.create(kind=LeaderboardChange.REBUILD)
+        with self._lock:
+            self._loaded_at = None
+
+    def _set_points(self, character_id, value):
+        old = self._points.get(character_id)
+        if old == value:
+            return
+        if old is not None:
+            del self._keys[bisect_left(self._keys, (-old, character_id))]
+        insort(self._keys, (-value, character_id))
+        self._points[character_id] = value
+
+    def _drop(self, character_id):
+        old = self._points.pop(character_id, None)
+        if old is not None:
+            del self._keys[bisect_left(self._keys, (-old, character_id))]
+        self._names.pop(character_id, None)
+
+    def _catch_up(self):
+        """Aplica as mudanças dos outros processos; ``False`` se é preciso recarregar."""
+        changes = list(
+            LeaderboardChange.objects.filter(pk__gt=self._generation)
+            .order_by("pk")
+            .values_list("pk", "kind", "character_id", "points", "name", "emoji")[:CHANGE_LOG_KEEP // 2]
+        )
+        if len(changes) == CHANGE_LOG_KEEP // 2:
+            return False  # atrasado demais (ou parte do log já foi apagada)
+        for generation, kind, character_id, points, name, emoji in changes:
+            if kind == LeaderboardChange.REBUILD:
+                return False
+            if kind == LeaderboardChange.POINTS:
+                self._set_points(character_id, points)
+            elif kind == LeaderboardChange.RENAME:
+                if character_id in self._points:
+                    self._names[character_id] = (name, emoji)
+            elif kind == LeaderboardChange.REMOVE:
+                self._drop(character_id)
+            self._generation = generation
+        return True
+
+    def _ensure_loaded(self):
+        now = time.monotonic()
+        if self._loaded_at is None or now - self._loaded_at > self.max_age:
+            self.rebuild()
+        elif now - self._checked_at > self.check_interval:
+            self._checked_at = now
+            if not self._catch_up():
+                self.rebuild()
+
+    def update(self, character_id, points):
+        self.update_many({character_id: points})
+
+    def update_many(self, points):
+        """Aplica ``{character_id: pontos}`` e publica as mudanças num só INSERT."""
+        with self._lock:
+            # não carregado aqui: a primeira leitura já vem com os valores novos
+            if self._loaded_at is not None:
+                for character_id, value in points.items():
+                    self._set_points(character_id, value)
+        LeaderboardChange.objects.bulk_create(
+            LeaderboardChange(kind=LeaderboardChange.POINTS, character_id=character_id, points=value)
+            for character_id, value in points.items()
+        )
+
+    def rename(self, character_id, name, emoji):
+        with self._lock:
+            if self._loaded_at is not None:
+                if character_id not in self._points or self._names.get(character_id) == (name, emoji):
+                    return  # fora do leaderboard, ou sem mudança
+                self._names[character_id] = (name, emoji)
+        LeaderboardChange.objects.create(
+            kind=LeaderboardChange.RENAME, character_id=character_id, name=name, emoji=emoji,
+        )
+
+    def remove(self, character_id):
+        with self._lock:
+            self._drop(character_id)
+        LeaderboardChange.objects.create(kind=LeaderboardChange.REMOVE, character_id=character_id)
+
+    def rank(self, character_id):
+        """Posição (1 = primeiro) do personagem, ou ``None`` se não está no ranking."""
+        with self._lock:
+            self._ensure_loaded()
+            points = self._points.get(character_id)
+            if points is None:
+                return None
+            return bisect_left(self._keys, (-points, character_id)) + 1
+
+    def top(self, n=5):
+        with self._lock:
+            self._ensure_loaded()
+            entries = []
+            for rank, (neg_points, character_id) in enumerate(self._keys[:n], start=1):
+                name, emoji = self._names.get(character_id, ("", ""))
+                entries.append(LeaderboardEntry(rank, character_id, -neg_points, name, emoji))
+            return entries
+
+    def __len__(self):
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._keys)
+
+
+leaderboard = Leaderboard()
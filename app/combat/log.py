@@ -0,0 +1,157 @@
+# combat/log.py
+"""
+Formatação (preguiçosa) do log de batalha a partir dos eventos do motor.
+
+O texto só é gerado quando o template percorre o log; quem consome a batalha
+por API pode usar diretamente ``BattleLog.events``.
+"""
+from typing import NamedTuple
+
+from .events import (
+    ACTOR_CHARACTER, EVENT_HIT, EVENT_MISS, EVENT_DEATH, EVENT_PASSIVE_NO_MANA,
+    EVENT_ATTRIBUTE_MOD, EVENT_STATUS, EVENT_PASSIVE_DAMAGE, EVENT_STATUS_DAMAGE, EVENT_TURN_LIMIT,
+    split_passive_ref,
+)
+
+# estilo visual de cada tipo de evento em combat/hunt.html
+EVENT_STYLES = {
+    EVENT_HIT: "success",
+    EVENT_MISS: "miss",
+    EVENT_DEATH: "death",
+    EVENT_ATTRIBUTE_MOD: "success",
+    EVENT_STATUS: "success",
+}
+
+STYLE_ICONS = {
+    "success": "✅",
+    "miss": "❌",
+    "crit": "💥",
+    "death": "💀",
+    "": "📝",
+}
+
+
+class LogEntry(NamedTuple):
+    text: str
+    style: str = ""
+
+    @property
+    def icon(self):
+        return STYLE_ICONS.get(self.style, "📝")
+
+    def __str__(self):
+        return self.text
+
+
+def _for_turns(duration):
+    if duration is None:
+        return "até o fim da luta"
+    return f"por {duration} turno(s)"
+
+
+class BattleLog:
+    """
+    Log de uma batalha. Guarda apenas os eventos; as linhas de texto são
+    montadas sob demanda. Mensagens extras (recompensas, drops) adicionadas
+    pela view com ``append`` aparecem depois dos turnos.
+    """
+
+    def __init__(self, events, names, passives, initial_hp):
+        self.events = events
+        self.names = names            # (personagem, monstro)
+        self.passives = passives      # (passivas do personagem, passivas do monstro)
+        self.initial_hp = initial_hp  # (personagem, monstro)
+        self.extra = []
+
+    def append(self, message):
+        self.extra.append(message)
+
+    def _passive(self, event):
+        passive_index, effect_index = split_passive_ref(event.ref)
+        passive = self.passives[event.actor][passive_index]
+        effects = passive.get("effects") or [{}]
+        return passive, effects[effect_index]
+
+    def _format(self, event, hp):
+        actor = self.names[event.actor]
+        other = self.names[1 - event.actor]
+        kind = event.kind
+
+        if kind == EVENT_HIT:
+            text = (
+                f"{actor} acerta {event.amount} dano "
+                f"{'(CRÍTICO)' if event.crit else ''} em {other} "
+                f"(hp restante: {max(0, hp[1 - event.actor])})."
+            )
+            return LogEntry(text, "crit" if event.crit else "success")
+
+        if kind == EVENT_MISS:
+            return LogEntry(f"{actor} errou o ataque em {other}.", "miss")
+
+        if kind == EVENT_DEATH:
+            if event.actor == ACTOR_CHARACTER:
+                return LogEntry(f"{actor} foi derrotado!", "death")
+            return LogEntry(f"{actor} morreu!", "death")
+
+        if kind == EVENT_TURN_LIMIT:
+            return LogEntry("Combate terminou por limite de turnos.")
+
+        passive, effect = self._passive(event)
+        name = passive.get("name")
+        target = effect.get("target") or "self"
+        payload = effect.get("payload") or {}
+
+        if kind == EVENT_PASSIVE_NO_MANA:
+            return LogEntry(f"Passiva {name} não pode ser ativada por falta de mana.")
+
+        if kind == EVENT_ATTRIBUTE_MOD:
+            attr = payload.get("attribute") or payload.get("attr")
+            duration = payload.get("duration", 1)
+            return LogEntry(
+                f"Passiva {name}: aplicou {event.amount} em {attr} para {target} {_for_turns(duration)}.",
+                EVENT_STYLES[kind],
+            )
+
+        if kind == EVENT_STATUS:
+            return LogEntry(
+                f"Passiva {name}: aplicou status {payload.get('status')} em {target} "
+                f"{_for_turns(event.amount or None)}.",
+                EVENT_STYLES[kind],
+            )
+
+        if kind == EVENT_PASSIVE_DAMAGE:
+            return LogEntry(f"Passiva {name}: causou {event.amount} de dano em {target}.")
+
+        if kind == EVENT_STATUS_DAMAGE:
+            return LogEntry(f"Status {payload.get('status')} ({name}) causou {event.amount} de dano em {target}.")
+
+        return LogEntry(f"Evento desconhecido ({kind}).")
+
+    @property
+    def turns(self):
+        """Lista de ``{"turn": n, "entries": [LogEntry, ...]}`` na ordem da batalha."""
+        turns = []
+        hp = list(self.initial_hp)
+        current = None
+
+        for event in self.events:
+            if current is None or current["turn"] != event.turn:
+                current = {"turn": event.turn, "entries": []}
+                turns.append(current)
+            if event.kind == EVENT_HIT:
+                hp[1 - event.actor] -= event.amount
+            elif event.kind in (EVENT_PASSIVE_DAMAGE, EVENT_STATUS_DAMAGE):
+                _, effect = self._passive(event)
+                on_self = (effect.get("target") or "self") == "self"
+                hp[event.actor if on_self else 1 - event.actor] -= event.amount
+            current["entries"].append(self._format(event, hp))
+
+        return turns
+
+    def __iter__(self):
+        """Linhas de texto, no formato do log antigo."""
+        for turn in self.turns:
+            yield f"--- Turno {turn['turn']} ---"
+            for entry in turn["entries"]:
+                yield entry.text
+        yield from self.extra
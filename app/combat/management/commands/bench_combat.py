@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from combat.benchmarks import run_benchmarks, compare_results, write_results, load_results
+
+
+class Command(BaseCommand):
+    help = "Mede o desempenho do motor de combate (sem banco) e grava o resultado em JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--battles", type=int, default=500, help="Batalhas por cenário")
+        parser.add_argument("--calls", type=int, default=50000, help="Chamadas por função medida")
+        parser.add_argument("--output", default="combat_bench.json", help="Arquivo JSON de saída")
+        parser.add_argument("--compare", help="JSON de uma execução anterior para comparar")
+        parser.add_argument(
+            "--quiet-logging", action="store_true",
+            help="Desliga logs DEBUG/INFO durante a medição (padrão: LOGGING do projeto)",
+        )
+
+    def handle(self, *args, **options):
+        data = run_benchmarks(battles=options["battles"], calls=options["calls"], quiet=options["quiet_logging"])
+        write_results(data, options["output"])
+
+        for name, result in data["results"].items():
+            if "battles_per_sec" in result:
+                rate = f"{result['battles_per_sec']:10.0f} batalhas/s"
+            else:
+                rate = f"{result['calls_per_sec']:10.0f} chamadas/s"
+            self.stdout.write(
+                f"{name:45} {rate}  p50 {result['p50_us']:8.1f}µs  "
+                f"{result['retained_bytes_per_call']:8.0f} B/chamada"
+            )
+
+        if options["compare"]:
+            baseline = load_results(options["compare"])
+            changes = compare_results(data, baseline)
+            self.stdout.write("")
+            logging_mode = baseline.get("params", {}).get("logging", "muted")
+            if logging_mode != data["params"]["logging"]:
+                self.stdout.write(self.style.WARNING(
+                    f"Atenção: baseline medido com logging '{logging_mode}', "
+                    f"esta execução com '{data['params']['logging']}'."
+                ))
+            for name, change in changes.items():
+                style = self.style.SUCCESS if change >= 0 else self.style.WARNING
+                self.stdout.write(style(f"{name:45} {change:+6.1f}%"))
+
+        self.stdout.write(self.style.SUCCESS(f"Resultados gravados em {options['output']}"))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from combat.leaderboard import leaderboard
+
+
+class Command(BaseCommand):
+    help = "Reconstrói do zero o leaderboard da arena a partir de ArenaRanking"
+
+    def handle(self, *args, **options):
+        leaderboard.request_rebuild()
+        leaderboard.rebuild()
+
+        for entry in leaderboard.top(5):
+            self.stdout.write(f"  {entry.rank}. {entry.name} - {entry.points} pts")
+
+        self.stdout.write(self.style.SUCCESS(f"Leaderboard reconstruído com {len(leaderboard)} participantes."))
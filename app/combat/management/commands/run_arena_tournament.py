@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+from character.models import loadout_related
+from combat.arena import apply_fight_results
+from combat.models import ArenaRanking
+from combat.tournament import arena_combatants, run_tournament
+
+
+class Command(BaseCommand):
+    help = "Roda um torneio de arena (todos contra todos ou suíço) entre os participantes do ranking"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--system", choices=("round-robin", "swiss"), default="round-robin")
+        parser.add_argument("--rounds", type=int, help="Rodadas do suíço (padrão: log2 dos participantes)")
+        parser.add_argument("--workers", type=int, help="Processos (padrão: número de CPUs)")
+        parser.add_argument("--seed", type=int, help="Seed para reproduzir o torneio")
+        parser.add_argument("--dry-run", action="store_true", help="Não grava os pontos")
+
+    def handle(self, *args, **options):
+        rankings = list(
+            # monstros também ganham um ArenaRanking, mas arena_fight só aceita jogadores
+            ArenaRanking.objects.filter(character__type="player")
+            .select_related("character", *loadout_related("character"))
+        )
+        if len(rankings) < 2:
+            raise CommandError("São necessários pelo menos 2 participantes no ranking.")
+
+        combatants = {r.character_id: arena_combatants(r.character) for r in rankings}
+        points = {r.character_id: r.points for r in rankings}
+
+        self.stdout.write(f"{len(rankings)} participantes, sistema {options['system']}...")
+        final_points, fights = run_tournament(
+            combatants, points,
+            system=options["system"], rounds=options["rounds"],
+            seed=options["seed"], workers=options["workers"],
+        )
+
+        if not options["dry_run"]:
+            # reaplica as lutas sobre os pontos atuais, com as linhas travadas
+            final_points.update(apply_fight_results(fights))
+        changed = [r for r in rankings if final_points[r.character_id] != r.points]
+
+        top = sorted(rankings, key=lambda r: -final_points[r.character_id])[:5]
+        for position, ranking in enumerate(top, start=1):
+            self.stdout.write(f"  {position}. {ranking.character.name} - {final_points[ranking.character_id]} pts")
+
+        action = "simulados" if options["dry_run"] else "atualizados"
+        self.stdout.write(self.style.SUCCESS(f"{len(fights)} lutas; pontos de {len(changed)} participantes {action}."))
@@ -0,0 +1,49 @@
+# combat/matchmaking.py
+"""
+Busca de oponentes da arena pelos pontos.
+
+A ordem da tabela é ``(points, id)``, que é única, então "acima" e "abaixo" de
+um jogador são conjuntos disjuntos e não há empate ambíguo. Os filtros são
+escritos como ``points >= x`` (e não ``points > x OR ...``) para o banco
+conseguir começar a leitura direto na posição do jogador no índice. As duas buscas
+saem em uma única consulta (duas subconsultas com LIMIT, em vez de UNION, que o
+SQLite não aceita com LIMIT) e cada lado é uma varredura curta no índice
+``arena_points_idx``, independente do tamanho do ranking.
+
+Todo personagem criado ganha uma linha em ``ArenaRanking`` (tasks/signals.py),
+inclusive monstros e NPCs, então as buscas filtram ``character__type="player"``.
+"""
+from django.db.models import Q
+
+from .models import ArenaRanking
+
+
+def nearest_opponents(ranking, k=4):
+    """
+    Os ``k`` oponentes logo acima e os ``k`` logo abaixo de ``ranking``,
+    ordenados do maior para o menor número de pontos.
+    """
+    points, pk = ranking.points, ranking.pk
+
+    above = (
+        ArenaRanking.objects
+        .filter(character__type="player", points__gte=points)
+        .exclude(points=points, id__lte=pk)
+        .order_by("points", "id")
+        .values("id")[:k]
+    )
+    below = (
+        ArenaRanking.objects
+        .filter(character__type="player", points__lte=points)
+        .exclude(points=points, id__gte=pk)
+        .order_by("-points", "-id")
+        .values("id")[:k]
+    )
+
+    return (
+        ArenaRanking.objects
+        .filter(Q(id__in=above) | Q(id__in=below))
+        .select_related("character")
+        .defer("defender_snapshot")
+        .order_by("-points", "-id")
+    )
@@ -0,0 +1,75 @@
+# combat/matchups.py
+"""
+Cache (por processo) das chances de vitória personagem x monstro.
+
+A entrada de cada personagem guarda o fingerprint dos seus atributos de combate
+(snapshot + hp atual) e as chances contra cada monstro já consultado. Se o
+fingerprint mudar, as chances antigas são descartadas. O cache mantém no máximo
+``max_characters`` personagens, descartando os usados há mais tempo (LRU).
+"""
+import threading
+from collections import OrderedDict
+
+from .battle import CombatantSnapshot
+from .odds import matchup_odds
+
+
+def character_fingerprint(snapshot, hp):
+    return hash((snapshot.key(), int(hp)))
+
+
+class MatchupCache:
+    def __init__(self, max_characters=5000):
+        self.max_characters = max_characters
+        self._entries = OrderedDict()  # character_id -> (fingerprint, {monster_id: odds})
+        self._lock = threading.Lock()
+
+    def get(self, character_id, fingerprint, monster_id):
+        with self._lock:
+            entry = self._entries.get(character_id)
+            if entry is None or entry[0] != fingerprint:
+                return None
+            self._entries.move_to_end(character_id)
+            return entry[1].get(monster_id)
+
+    def set(self, character_id, fingerprint, monster_id, odds):
+        with self._lock:
+            entry = self._entries.get(character_id)
+            if entry is None or entry[0] != fingerprint:
+                entry = (fingerprint, {})
+                self._entries[character_id] = entry
+            entry[1][monster_id] = odds
+            self._entries.move_to_end(character_id)
+            while len(self._entries) > self.max_characters:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, character_id):
+        with self._lock:
+            self._entries.pop(character_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+matchup_cache = MatchupCache()
+
+
+def get_matchup_odds(character, hunt_monster, char_snapshot=None):
+    """Chances de ``character`` contra o monstro de um ``HuntMonster`` (com cache)."""
+    if char_snapshot is None:
+        char_snapshot = CombatantSnapshot.from_character(character)
+    fingerprint = character_fingerprint(char_snapshot, character.hp)
+
+    odds = matchup_cache.get(character.pk, fingerprint, hunt_monster.monster_id)
+    if odds is None:
+        monster = hunt_monster.monster
+        odds = matchup_odds(
+            char_snapshot, character.hp,
+            CombatantSnapshot.from_character(monster), monster.hp,
+        )
+        matchup_cache.set(character.pk, fingerprint, hunt_monster.monster_id, odds)
+    return odds
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("character", "0011_delete_monster"),
+        ("combat", "0002_arenaranking"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="encounterlog",
+            name="character",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="encounters",
+                to="character.character",
+            ),
+        ),
+        migrations.AddField(
+            model_name="encounterlog",
+            name="events",
+            field=models.BinaryField(blank=True, default=b""),
+        ),
+        migrations.AddField(
+            model_name="encounterlog",
+            name="opponent",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="character.character",
+            ),
+        ),
+        migrations.AddField(
+            model_name="encounterlog",
+            name="seed",
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="encounterlog",
+            name="snapshot_hash",
+            field=models.CharField(blank=True, max_length=32),
+        ),
+        migrations.AddField(
+            model_name="encounterlog",
+            name="turns",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("character", "0011_delete_monster"),
+        ("combat", "0003_encounterlog_replay"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="arenaranking",
+            index=models.Index(fields=["points", "id"], name="arena_points_idx"),
+        ),
+    ]
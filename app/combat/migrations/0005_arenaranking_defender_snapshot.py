@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("combat", "0004_arenaranking_points_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="arenaranking",
+            name="defender_snapshot",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("combat", "0006_leaderboardversion"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LeaderboardChange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.PositiveSmallIntegerField(
+                        choices=[
+                            (0, "Recarregar"),
+                            (1, "Pontos"),
+                            (2, "Nome"),
+                            (3, "Remoção"),
+                        ]
+                    ),
+                ),
+                ("character_id", models.IntegerField(blank=True, null=True)),
+                ("points", models.IntegerField(blank=True, null=True)),
+                ("name", models.CharField(blank=True, max_length=100)),
+                ("emoji", models.CharField(blank=True, max_length=5)),
+            ],
+        ),
+        migrations.DeleteModel(
+            name="LeaderboardVersion",
+        ),
+    ]
@@ -6,12 +6,53 @@ class EncounterLog(models.Model):
     summary = models.TextField(blank=True)
     winner = models.CharField(max_length=50, blank=True, null=True)
 
+    # Dados para reproduzir a batalha (ver combat/replay.py)
+    character = models.ForeignKey(
+        "character.Character", null=True, blank=True, on_delete=models.SET_NULL, related_name="encounters"
+    )
+    opponent = models.ForeignKey(
+        "character.Character", null=True, blank=True, on_delete=models.SET_NULL, related_name="+"
+    )
+    seed = models.PositiveBigIntegerField(null=True, blank=True)
+    snapshot_hash = models.CharField(max_length=32, blank=True)
+    turns = models.PositiveSmallIntegerField(default=0)
+    events = models.BinaryField(blank=True, default=b"")
+
     def __str__(self):
         return f"Encounter {self.id} - {self.winner or 'N/A'}"
     
 class ArenaRanking(models.Model):
     character = models.OneToOneField("character.Character", on_delete=models.CASCADE)
     points = models.IntegerField(default=1000)
+    # CombatantSnapshot.to_dict() de quando o personagem é desafiado (ver combat/arena.py)
+    defender_snapshot = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        indexes = [
+            # matchmaking (vizinhos por pontos) e top do ranking, ver combat/matchmaking.py
+            models.Index(fields=["points", "id"], name="arena_points_idx"),
+        ]
 
     def __str__(self):
-        return f"{self.character.name} - {self.points} pts"
\ No newline at end of file
+        return f"{self.character.name} - {self.points} pts"
+
+
+class LeaderboardChange(models.Model):
+    """
+    Log das mudanças do leaderboard da arena, lido por todos os processos
+    (ver combat/leaderboard.py). O id de cada linha é a geração.
+    """
+    REBUILD, POINTS, RENAME, REMOVE = range(4)
+    KIND_CHOICES = [
+        (REBUILD, "Recarregar"),
+        (POINTS, "Pontos"),
+        (RENAME, "Nome"),
+        (REMOVE, "Remoção"),
+    ]
+
+    kind = models.PositiveSmallIntegerField(choices=KIND_CHOICES)
+    # sem FK: a remoção continua no log depois que o personagem some
+    character_id = models.IntegerField(null=True, blank=True)
+    points = models.IntegerField(null=True, blank=True)
+    name = models.CharField(max_length=100, blank=True)
+    emoji = models.CharField(max_length=5, blank=True)
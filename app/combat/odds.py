@@ -0,0 +1,136 @@
+# combat/odds.py
+"""
+Probabilidades EXATAS de um combate 1x1 sem passivas.
+
+Sem passivas, chance de acerto e distribuição de dano não dependem do hp, então
+a cadeia de Markov sobre ``(char_hp, monster_hp)`` se separa em duas cadeias
+independentes (uma por lado). Basta propagar, turno a turno até ``MAX_TURNS``,
+a distribuição do hp de cada um e combinar as probabilidades de sobrevivência:
+
+    vitória no turno t  = (m[t-1] - m[t]) * c[t-1]
+    derrota no turno t  = m[t] * (c[t-1] - c[t])
+    empate              = m[T] * c[T]
+
+onde ``m[t]``/``c[t]`` são as chances de monstro/personagem seguirem vivos após
+``t`` ataques recebidos. O resultado é memoizado pela distribuição de dano e hp
+iniciais, então consultas repetidas custam praticamente nada.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from .battle import CombatantSnapshot, compute_hit_chance, compute_raw_damage
+from .engine import MAX_TURNS
+
+
+def _add_rounded(dist, lo, hi, mult, weight):
+    """
+    Soma em ``dist`` a distribuição de ``round(x * mult)`` com ``x`` uniforme em
+    ``[lo, hi]`` (massa total ``weight``).
+    """
+    if hi <= lo:
+        return
+    density = weight / (hi - lo)
+    k = int(np.floor(lo * mult + 0.5))
+    last = int(np.floor(hi * mult + 0.5))
+    while k <= last:
+        # round(v) == k  <=>  v em [k - 0.5, k + 0.5)
+        start = max(lo, (k - 0.5) / mult)
+        end = min(hi, (k + 0.5) / mult)
+        if end > start:
+            value = max(1, k)
+            dist[value] = dist.get(value, 0.0) + (end - start) * density
+        k += 1
+
+
+def damage_distribution(attacker, defender, damage_type="physical"):
+    """
+    Distribuição exata do dano de UM ataque (0 = erro), seguindo
+    ``compute_hit_chance`` e ``compute_damage``. Retorna ``{dano: probabilidade}``.
+    """
+    hit = compute_hit_chance(attacker, defender) / 100.0
+    raw = compute_raw_damage(attacker, attacker.secondary, defender, defender.secondary, damage_type)
+    crit = attacker.secondary["crit_chance"] / 100
+
+    weakness = 1 + max(0.0, defender.weakness_against(attacker))
+    dist = {0: 1.0 - hit}
+
+    for mult, chance in ((weakness, 1 - crit), (attacker.secondary["crit_damage"] * weakness, crit)):
+        weight = hit * chance
+        if weight <= 0:
+            continue
+
+        # dmg = max(1, raw + U), U uniforme em [-1, 1]
+        floor_mass = min(1.0, max(0.0, (2 - raw) / 2))
+        if floor_mass > 0:
+            value = max(1, round(1.0 * mult))
+            dist[value] = dist.get(value, 0.0) + weight * floor_mass
+        lo, hi = max(1.0, raw - 1), raw + 1
+        _add_rounded(dist, lo, hi, mult, weight * (1 - floor_mass))
+
+    return dist
+
+
+def _survival_curve(hp, dist, turns):
+    """Chance de seguir vivo (hp > 0) depois de 0..turns ataques."""
+    survival = np.ones(turns + 1)
+    if hp <= 0:
+        survival[1:] = 0.0
+        return survival
+
+    alive = np.zeros(hp + 1)
+    alive[hp] = 1.0
+    for t in range(1, turns + 1):
+        after = np.zeros(hp + 1)
+        for dmg, p in dist:
+            if dmg == 0:
+                after += p * alive
+            elif dmg <= hp:
+                after[:hp + 1 - dmg] += p * alive[dmg:]
+        after[0] = 0.0  # hp 0 = morto
+        alive = after
+        survival[t] = alive.sum()
+    return survival
+
+
+@lru_cache(maxsize=4096)
+def _solve(char_hp, char_dist, mon_hp, mon_dist, turns):
+    monster_alive = _survival_curve(mon_hp, mon_dist, turns)
+    char_alive = _survival_curve(char_hp, char_dist, turns)
+
+    win_at = (monster_alive[:-1] - monster_alive[1:]) * char_alive[:-1]
+    lose_at = monster_alive[1:] * (char_alive[:-1] - char_alive[1:])
+    draw = float(monster_alive[-1] * char_alive[-1])
+
+    rounds = np.arange(1, turns + 1)
+    return {
+        "win": max(0.0, float(win_at.sum())),
+        "lose": max(0.0, float(lose_at.sum())),
+        "draw": max(0.0, draw),
+        "expected_turns": float((rounds * (win_at + lose_at)).sum() + turns * draw),
+    }
+
+
+def _freeze(dist):
+    return tuple(sorted(dist.items()))
+
+
+def matchup_odds(char_snapshot, char_hp, mon_snapshot, mon_hp,
+                 char_atk_type=None, monster_atk_type="physical", turns=MAX_TURNS):
+    """Probabilidades de vitória/derrota/empate e número esperado de turnos."""
+    if char_atk_type is None:
+        char_atk_type = char_snapshot.attack_type
+
+    # dano que o MONSTRO recebe / dano que o PERSONAGEM recebe
+    mon_dist = damage_distribution(char_snapshot, mon_snapshot, char_atk_type)
+    char_dist = damage_distribution(mon_snapshot, char_snapshot, monster_atk_type)
+
+    return dict(_solve(int(char_hp), _freeze(char_dist), int(mon_hp), _freeze(mon_dist), turns))
+
+
+def battle_odds(character, monster):
+    """Atalho de ``matchup_odds`` a partir dos modelos."""
+    return matchup_odds(
+        CombatantSnapshot.from_character(character), character.hp,
+        CombatantSnapshot.from_character(monster), monster.hp,
+    )
@@ -0,0 +1,168 @@
+# combat/passives.py
+"""
+Compilação das passivas de equipamento.
+
+O JSON de ``Equipment.passive_skill`` é lido UMA vez por batalha e vira uma
+tabela ``{trigger: (CompiledPassive, ...)}``. Cada efeito já sai pronto como
+uma função ``effect(source_state, target_state, battle_state)``, então o loop
+de turnos só toca nas passivas do trigger que está disparando.
+
+Novos tipos de efeito são registrados com ``@register_effect("tipo")``: a
+função recebe ``(payload, target, ref)`` e devolve o callable do efeito (ou
+``None`` se o payload for inválido).
+"""
+import logging
+
+from .effects import STATUS_DAMAGE
+from .events import (
+    BattleEvent, EVENT_ATTRIBUTE_MOD, EVENT_STATUS, EVENT_PASSIVE_DAMAGE, MAX_PASSIVES, MAX_PASSIVE_EFFECTS,
+    passive_ref,
+)
+
+logger = logging.getLogger(__name__)
+
+VALID_TRIGGERS = {"on_turn_start", "on_attack", "on_defend", "on_hit", "on_receive_damage"}
+
+EFFECT_REGISTRY = {}
+
+
+def register_effect(*effect_types):
+    def decorator(builder):
+        for effect_type in effect_types:
+            EFFECT_REGISTRY[effect_type] = builder
+        return builder
+    return decorator
+
+
+class CompiledPassive:
+    __slots__ = ("index", "name", "cost", "effects")
+
+    def __init__(self, index, name, cost, effects):
+        self.index = index
+        self.name = name
+        self.cost = cost
+        self.effects = effects
+
+
+def _emit(battle_state, source_state, kind, amount, ref):
+    events = battle_state["events"]
+    if events is not None:  # None no modo "summary"
+        events.append(BattleEvent(battle_state["turn"], source_state["actor"], kind, amount, False, ref))
+
+
+@register_effect("attribute_mod", "attr_mod")
+def build_attribute_mod(payload, target, ref):
+    attr = payload.get("attribute") or payload.get("attr")
+    if not attr:
+        return None
+    value = payload.get("value", 0)
+    duration = payload.get("duration", 1)  # None = até o fim da luta
+    on_self = target == "self"
+
+    def effect(source_state, target_state, battle_state):
+        tgt_state = source_state if on_self else target_state
+        battle_state["effects"].add_modifier(tgt_state, attr, value, battle_state["turn"], duration)
+        _emit(battle_state, source_state, EVENT_ATTRIBUTE_MOD, value, ref)
+
+    return effect
+
+
+@register_effect("status_effect")
+def build_status_effect(payload, target, ref):
+    status = payload.get("status")
+    if not status:
+        return None
+    duration = payload.get("duration", 1)  # None = até o fim da luta
+    if duration is not None:
+        duration = max(1, int(duration))
+    damage = payload.get("damage", STATUS_DAMAGE.get(status, 0))
+    on_self = target == "self"
+
+    def effect(source_state, target_state, battle_state):
+        tgt_state = source_state if on_self else target_state
+        battle_state["effects"].add_status(
+            tgt_state, status, battle_state["turn"], duration, damage, source_state["actor"], ref,
+        )
+        _emit(battle_state, source_state, EVENT_STATUS, duration or 0, ref)
+
+    return effect
+
+
+@register_effect("deal_damage")
+def build_deal_damage(payload, target, ref):
+    damage = payload.get("damage", 0)
+    on_self = target == "self"
+
+    def effect(source_state, target_state, battle_state):
+        tgt_state = source_state if on_self else target_state
+        tgt_state["hp"] -= damage
+        _emit(battle_state, source_state, EVENT_PASSIVE_DAMAGE, damage, ref)
+
+    return effect
+
+
+# tipos de efeito desconhecidos já avisados neste processo (passivas são
+# compiladas a cada batalha; um aviso por tipo basta)
+_unknown_effect_types = set()
+
+
+def _warn_unknown_effect(effect_type, passive):
+    if effect_type in _unknown_effect_types:
+        return
+    _unknown_effect_types.add(effect_type)
+    logger.warning("Efeito de passiva desconhecido %r ignorado (passiva %s)", effect_type, passive.get("name"))
+
+
+def compile_passives(passives):
+    """
+    Compila a lista de passivas (JSON) em uma tabela indexada por trigger.
+    Passivas sem efeitos, com trigger desconhecido ou com efeitos inválidos são descartadas,
+    assim como o que passar de ``MAX_PASSIVES`` passivas ou ``MAX_PASSIVE_EFFECTS``
+    efeitos por passiva (limites da referência gravada nos eventos).
+    """
+    table = {}
+
+    if len(passives) > MAX_PASSIVES:
+        logger.warning("Mais de %d passivas; as excedentes foram ignoradas", MAX_PASSIVES)
+        passives = passives[:MAX_PASSIVES]
+
+    for passive_index, passive in enumerate(passives):
+        trigger = passive.get("trigger")
+        if trigger not in VALID_TRIGGERS:
+            continue
+
+        passive_effects = passive.get("effects") or []
+        if len(passive_effects) > MAX_PASSIVE_EFFECTS:
+            logger.warning(
+                "Passiva %s tem mais de %d efeitos; os excedentes foram ignorados",
+                passive.get("name"), MAX_PASSIVE_EFFECTS,
+            )
+            passive_effects = passive_effects[:MAX_PASSIVE_EFFECTS]
+
+        effects = []
+        for effect_index, effect in enumerate(passive_effects):
+            effect_type = effect.get("type")
+            builder = EFFECT_REGISTRY.get(effect_type)
+            if builder is None:
+                _warn_unknown_effect(effect_type, passive)
+                continue
+            try:
+                compiled = builder(
+                    effect.get("payload") or {},
+                    effect.get("target") or "self",
+                    passive_ref(passive_index, effect_index),
+                )
+            except Exception as e:
+                logger.exception("Erro compilando passiva %s: %s", passive, e)
+                continue
+            if compiled is not None:
+                effects.append(compiled)
+
+        if not effects:
+            continue
+
+        table.setdefault(trigger, []).append(
+            CompiledPassive(passive_index, passive.get("name"), passive.get("cost") or 0, tuple(effects))
+        )
+
+    return {trigger: tuple(entries) for trigger, entries in table.items()}
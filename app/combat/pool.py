@@ -0,0 +1,23 @@
+# combat/pool.py
+"""
+Código que roda dentro dos processos do pool de torneios (combat/tournament.py).
+
+Só importa o núcleo do combate (sem Django): com os métodos de início
+``spawn``/``forkserver`` os processos importam este módulo do zero, antes de
+qualquer ``django.setup()``.
+"""
+from .engine import run_combat
+
+# {character_id: (como desafiante, como desafiado)} de cada processo
+_combatants = {}
+
+
+def init_worker(combatants):
+    global _combatants
+    _combatants = combatants
+
+
+def fight(task):
+    attacker_id, defender_id, seed = task
+    battle = run_combat(_combatants[attacker_id][0], _combatants[defender_id][1], seed=seed, mode="summary")
+    return battle.winner == "character"
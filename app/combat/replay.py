@@ -0,0 +1,52 @@
+# combat/replay.py
+"""
+Histórico compacto de batalhas.
+
+Em vez de guardar o log em texto, cada ``EncounterLog`` guarda o seed da
+batalha, o hash dos combatentes e a sequência binária de eventos. Com isso a
+luta pode ser reconstruída exatamente a partir de poucas centenas de bytes.
+"""
+import copy
+
+from .adapters import run_battle
+from .events import decode_events, encode_events
+from .models import EncounterLog
+
+
+def record_encounter(result):
+    """Grava o resultado de ``run_battle`` em um ``EncounterLog``."""
+    character = result["character"]
+    monster = result["monster"]
+
+    return EncounterLog.objects.create(
+        character=character,
+        opponent=monster,
+        summary=f"{character.name} vs {monster.name}",
+        winner=result["winner"],
+        seed=result["seed"],
+        snapshot_hash=result["snapshot_hash"],
+        turns=result["battle_stats"]["turns_taken"],
+        events=encode_events(result["events"], **result["initial"]),
+    )
+
+
+def replay_encounter(encounter, character=None, monster=None):
+    """
+    Reexecuta a batalha de um ``EncounterLog``.
+
+    Os combatentes são copiados e recebem o hp/mana do início da luta.
+    Levanta ``ValueError`` se os atributos de combate mudaram desde então.
+    """
+    character = copy.copy(character or encounter.character)
+    monster = copy.copy(monster or encounter.opponent)
+
+    initial, _ = decode_events(encounter.events)
+    character.hp, character.mana = initial["char_hp"], initial["char_mana"]
+    monster.hp, monster.mana = initial["mon_hp"], initial["mon_mana"]
+
+    result = run_battle(character, monster, seed=encounter.seed)
+
+    if result["snapshot_hash"] != encounter.snapshot_hash:
+        raise ValueError("Os combatentes mudaram desde a batalha; não é possível reproduzi-la.")
+
+    return result
@@ -0,0 +1,85 @@
+# combat/signals.py
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.db.models import Q
+from django.dispatch import receiver
+from character.constants import EQUIPMENT_SLOTS
+from character.models import Character
+from character.signals import combat_stats_changed
+from combat.arena import refresh_defender_snapshot
+from combat.leaderboard import leaderboard
+from combat.matchups import matchup_cache
+from combat.models import ArenaRanking
+from items.models import Equipment
+
+
+@receiver(combat_stats_changed, sender=Character)
+def invalidate_matchup_odds(sender, instance, **kwargs):
+    matchup_cache.invalidate(instance.pk)
+
+
+@receiver(combat_stats_changed, sender=Character)
+def refresh_arena_defender(sender, instance, **kwargs):
+    refresh_defender_snapshot(instance)
+
+
+@receiver(post_save, sender=Character)
+def invalidate_monster_odds(sender, instance, created, **kwargs):
+    # monstros editados mudam as chances de todo mundo
+    if instance.type == "monster" and not created:
+        matchup_cache.clear()
+
+
+def _refresh_wearers(equipment, removed=False):
+    wearing = Q()
+    for slot in EQUIPMENT_SLOTS:
+        wearing |= Q(**{slot: equipment})
+    for character in Character.objects.with_loadout().filter(wearing):
+        if removed:
+            # o SET_NULL do slot só acontece depois deste sinal
+            for slot in EQUIPMENT_SLOTS:
+                if getattr(character, f"{slot}_id") == equipment.pk:
+                    setattr(character, slot, None)
+        character.refresh_combat_stats()
+        character.save(update_fields=Character.COMBAT_STATS_FIELDS)
+        combat_stats_changed.send(sender=Character, instance=character)
+
+
+@receiver(post_save, sender=Equipment)
+def refresh_wearers_stats(sender, instance, created, **kwargs):
+    # bônus/fraqueza do equipamento editados (admin) -> recalcula quem está usando
+    if not created:
+        _refresh_wearers(instance)
+
+
+@receiver(pre_delete, sender=Equipment)
+def unequip_deleted_equipment(sender, instance, **kwargs):
+    # equipamento (ou o Item dele) apagado -> quem usava perde os bônus
+    _refresh_wearers(instance, removed=True)
+
+
+@receiver(post_save, sender=Character)
+def rename_leaderboard_entry(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and not {"name", "emoji"} & set(update_fields):
+        return
+    if instance.type == "player":
+        pk, name, emoji = instance.pk, instance.name, instance.emoji
+        transaction.on_commit(lambda: leaderboard.rename(pk, name, emoji))
+
+
+@receiver(post_save, sender=ArenaRanking)
+def update_leaderboard(sender, instance, created, **kwargs):
+    if instance.character.type != "player":
+        return  # monstros e NPCs também ganham ranking, mas não disputam a arena
+    # só depois do commit: um rollback não pode deixar pontos fantasmas na lista
+    character_id, points = instance.character_id, instance.points
+    transaction.on_commit(lambda: leaderboard.update(character_id, points))
+    if created:
+        name, emoji = instance.character.name, instance.character.emoji
+        transaction.on_commit(lambda: leaderboard.rename(character_id, name, emoji))
+
+
+@receiver(post_delete, sender=ArenaRanking)
+def remove_from_leaderboard(sender, instance, **kwargs):
+    character_id = instance.character_id
+    transaction.on_commit(lambda: leaderboard.remove(character_id))
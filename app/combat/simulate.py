@@ -0,0 +1,106 @@
+# combat/simulate.py
+"""
+Simulador Monte Carlo vetorizado (NumPy) das regras de ``run_battle``.
+
+Cada posição dos arrays é uma batalha independente; todas avançam juntas,
+turno a turno, com a mesma matemática de ``compute_hit_chance`` e
+``compute_damage`` (chance de acerto, variação de dano, crítico e fraqueza).
+
+Passivas de equipamento NÃO são simuladas: o resultado corresponde ao combate
+"puro" entre os atributos dos dois combatentes.
+"""
+import numpy as np
+
+from .battle import CombatantSnapshot, compute_hit_chance, compute_raw_damage
+from .engine import MAX_TURNS
+
+DRAW = 0
+CHARACTER_WON = 1
+MONSTER_WON = 2
+
+
+def _roll_attacks(rng, size, attacker, defender, damage_type):
+    """
+    Rola ``size`` ataques de ``attacker`` contra ``defender``.
+    Retorna o dano de cada ataque (0 quando erra).
+    """
+    hit_chance = compute_hit_chance(attacker, defender)
+    raw = compute_raw_damage(attacker, attacker.secondary, defender, defender.secondary, damage_type)
+
+    hits = rng.random(size) * 100.0 < hit_chance
+
+    dmg = np.maximum(1.0, raw + rng.uniform(-1.0, 1.0, size))
+
+    crits = rng.random(size) < (attacker.secondary["crit_chance"] / 100)
+    dmg = np.where(crits, dmg * attacker.secondary["crit_damage"], dmg)
+
+    weakness = defender.weakness_against(attacker)
+    if weakness > 0:
+        dmg *= (1 + weakness)
+
+    # np.round arredonda para o par mais próximo, igual ao round() do Python
+    dmg = np.maximum(1, np.round(dmg))
+
+    return np.where(hits, dmg, 0)
+
+
+def simulate_snapshots(char_snapshot, char_hp, mon_snapshot, mon_hp, battles=10000,
+                       seed=None, char_atk_type=None, monster_atk_type="physical"):
+    """
+    Executa ``battles`` combates entre dois snapshots e devolve as estatísticas agregadas.
+    """
+    rng = np.random.default_rng(seed)
+    if char_atk_type is None:
+        char_atk_type = char_snapshot.attack_type
+
+    char_hps = np.full(battles, char_hp, dtype=np.int64)
+    mon_hps = np.full(battles, mon_hp, dtype=np.int64)
+    outcome = np.full(battles, DRAW, dtype=np.int8)
+    turns = np.full(battles, MAX_TURNS, dtype=np.int16)
+
+    running = np.arange(battles)
+
+    for t in range(1, MAX_TURNS + 1):
+        if not running.size:
+            break
+
+        # PERSONAGEM ATACA
+        mon_hps[running] -= _roll_attacks(rng, running.size, char_snapshot, mon_snapshot, char_atk_type).astype(np.int64)
+        dead = mon_hps[running] <= 0
+        outcome[running[dead]] = CHARACTER_WON
+        turns[running[dead]] = t
+        running = running[~dead]
+
+        # MONSTRO ATACA
+        char_hps[running] -= _roll_attacks(rng, running.size, mon_snapshot, char_snapshot, monster_atk_type).astype(np.int64)
+        dead = char_hps[running] <= 0
+        outcome[running[dead]] = MONSTER_WON
+        turns[running[dead]] = t
+        running = running[~dead]
+
+    wins = outcome == CHARACTER_WON
+    hp_left = np.maximum(0, char_hps)
+
+    return {
+        "battles": battles,
+        "win_rate": float(wins.mean()),
+        "loss_rate": float((outcome == MONSTER_WON).mean()),
+        "draw_rate": float((outcome == DRAW).mean()),
+        "avg_turns": float(turns.mean()),
+        # turns_distribution[t] = quantidade de batalhas que terminaram no turno t
+        "turns_distribution": np.bincount(turns, minlength=MAX_TURNS + 1).tolist(),
+        "avg_hp_left": float(hp_left.mean()),
+        "avg_hp_left_on_win": float(hp_left[wins].mean()) if wins.any() else 0.0,
+        "hp_left_percentiles": {
+            p: float(v) for p, v in zip((10, 50, 90), np.percentile(hp_left, (10, 50, 90)))
+        },
+    }
+
+
+def simulate_battles(character, monster, battles=10000, seed=None):
+    """Estima as chances de ``character`` contra ``monster`` simulando ``battles`` combates."""
+    return simulate_snapshots(
+        CombatantSnapshot.from_character(character), character.hp,
+        CombatantSnapshot.from_character(monster), monster.hp,
+        battles=battles, seed=seed,
+    )
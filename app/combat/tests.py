@@ -1,3 +1,379 @@
+from unittest import mock
+
 from django.test import TestCase
 
-# Create your tests here.
+from character.models import Character
+from items.models import Equipment, Item
+
+from . import arena
+from .adapters import run_battle
+from .battle import Combatant, CombatantSnapshot, compute_hit_chance
+from .effects import ActiveEffects
+from .engine import run_combat
+from .events import (
+    EVENT_ATTRIBUTE_MOD, EVENT_PASSIVE_DAMAGE, EVENT_STATUS, EVENT_STATUS_DAMAGE, MAX_PASSIVE_EFFECTS, BattleEvent,
+    decode_events, encode_events, split_passive_ref,
+)
+from .leaderboard import Leaderboard
+from .log import BattleLog
+from .matchmaking import nearest_opponents
+from .models import ArenaRanking, EncounterLog, LeaderboardChange
+from .odds import damage_distribution, matchup_odds
+from .passives import compile_passives
+from .replay import record_encounter, replay_encounter
+from .simulate import simulate_snapshots
+
+
+def make_ranked(name, points, type="player"):
+    character = Character.objects.create(name=name, type=type)
+    # o ranking nasce junto com o jogador (tasks/signals.py)
+    ArenaRanking.objects.filter(character=character).update(points=points)
+    return ArenaRanking.objects.get(character=character)
+
+
+class LeaderboardTests(TestCase):
+    def setUp(self):
+        self.rankings = [make_ranked(f"P{i}", 1000 + i) for i in range(3)]
+        # dois "processos": cada um com a sua lista em memória
+        self.writer = Leaderboard(check_interval=0)
+        self.reader = Leaderboard(check_interval=0)
+        self.assertEqual(self.writer.top(3), self.reader.top(3))
+
+    def test_reader_applies_only_new_changes(self):
+        last = self.rankings[0]
+        self.writer.update(last.character_id, 5000)
+
+        with self.assertNumQueries(1):
+            top = self.reader.top(1)
+        self.assertEqual((top[0].character_id, top[0].points), (last.character_id, 5000))
+
+    def test_rename_and_remove_reach_other_processes(self):
+        character_id = self.rankings[2].character_id
+        self.writer.rename(character_id, "Novo", "🐉")
+        self.assertEqual(self.reader.top(1)[0].name, "Novo")
+
+        self.writer.remove(character_id)
+        self.assertIsNone(self.reader.rank(character_id))
+        self.assertEqual(len(self.reader), 2)
+
+    def test_rebuild_request_reloads_everyone(self):
+        ArenaRanking.objects.filter(pk=self.rankings[0].pk).update(points=9000)
+        self.writer.request_rebuild()
+
+        self.assertEqual(self.reader.top(1)[0].character_id, self.rankings[0].character_id)
+
+    def test_signals_publish_after_commit(self):
+        ranking = self.rankings[0]
+        ranking.points = 7000
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            ranking.save()
+        self.assertFalse(LeaderboardChange.objects.exists())
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.reader.top(1)[0].character_id, ranking.character_id)
+
+
+class NearestOpponentsTests(TestCase):
+    def test_only_players_are_matched(self):
+        me = make_ranked("Eu", 1000)
+        players = [make_ranked(f"P{i}", 990 + 5 * i) for i in range(4)]
+        for i in range(4):
+            make_ranked(f"Lobo{i}", 998 + i, type="monster")
+
+        opponents = list(nearest_opponents(me, k=2))
+
+        self.assertEqual(
+            [ranking.character_id for ranking in opponents],
+            [players[3].character_id, players[2].character_id, players[1].character_id, players[0].character_id],
+        )
+
+    def test_leaderboard_ignores_monsters(self):
+        make_ranked("Eu", 1000)
+        monster = make_ranked("Dragão", 9000, type="monster")
+        leaderboard = Leaderboard()
+
+        self.assertIsNone(leaderboard.rank(monster.character_id))
+        self.assertEqual(len(leaderboard), 1)
+
+
+class DeletedEquipmentTests(TestCase):
+    def test_wearers_lose_the_bonus(self):
+        item = Item.objects.create(name="Elmo", description="", emoji="🪖", item_type="equipment")
+        helmet = Equipment.objects.create(
+            item=item,
+            slot="head",
+            attribute_bonuses={"constitution": 5},
+            stats={"defense": {"value": 2, "weakness": "slash"}},
+            passive_skill={},
+        )
+        character = Character.objects.create(name="Eu", type="player", constitution=3, equipped_head=helmet)
+        character.refresh_combat_stats()
+        character.save()
+        ranking = ArenaRanking.objects.get(character=character)
+
+        item.delete()
+
+        character.refresh_from_db()
+        self.assertIsNone(character.equipped_head)
+        self.assertEqual(character.combat_stats["attrs"]["constitution"], 3)
+        self.assertEqual(character.weakness_vector["slash"], 0.0)
+        ranking.refresh_from_db()
+        self.assertEqual(ranking.defender_snapshot["attrs"]["constitution"], 3)
+        self.assertEqual(ranking.defender_snapshot["armor"], 0)
+
+
+def combat_state(actor):
+    return {"actor": actor, "hp": 20, "_temp_attrs": {}, "_secondary": None, "statuses": {}}
+
+
+class UnlimitedDurationTests(TestCase):
+    passives = [{
+        "name": "Veneno",
+        "trigger": "on_hit",
+        "effects": [
+            {"type": "status_effect", "target": "enemy", "payload": {"status": "poison", "duration": None}},
+            {"type": "attribute_mod", "target": "self", "payload": {"attribute": "strength", "value": 2, "duration": None}},
+        ],
+    }]
+
+    def test_status_lasts_the_whole_fight(self):
+        source, target = combat_state(0), combat_state(1)
+        battle_state = {"turn": 1, "events": [], "effects": ActiveEffects()}
+        for effect in compile_passives(self.passives)["on_hit"][0].effects:
+            effect(source, target, battle_state)
+        for turn in range(2, 12):
+            battle_state["effects"].start_turn(turn, battle_state["events"])
+
+        self.assertEqual(target["statuses"], {"poison": 1})
+        self.assertEqual(target["hp"], 10)
+        self.assertEqual(source["_temp_attrs"], {"strength": 2})
+        kinds = [event.kind for event in battle_state["events"]]
+        self.assertEqual(kinds.count(EVENT_STATUS_DAMAGE), 10)
+
+        log = BattleLog(battle_state["events"][:2], ("Eu", "Lobo"), (self.passives, []), (20, 20))
+        texts = [log._format(event, [20, 20]).text for event in log.events]
+        self.assertEqual(battle_state["events"][0].kind, EVENT_STATUS)
+        self.assertTrue(all(text.endswith("até o fim da luta.") for text in texts), texts)
+
+
+class PassiveRefLimitTests(TestCase):
+    def test_extra_effects_are_dropped_instead_of_spilling_into_the_passive_index(self):
+        passive = {
+            "name": "Mil cortes",
+            "trigger": "on_hit",
+            "effects": [{"type": "deal_damage", "target": "enemy", "payload": {"damage": 1}}] * 20,
+        }
+        source, target = combat_state(0), combat_state(1)
+        battle_state = {"turn": 1, "events": [], "effects": ActiveEffects()}
+
+        with self.assertLogs("combat.passives", "WARNING"):
+            compiled = compile_passives([passive])
+        for effect in compiled["on_hit"][0].effects:
+            effect(source, target, battle_state)
+
+        self.assertEqual(len(battle_state["events"]), MAX_PASSIVE_EFFECTS)
+        self.assertEqual(
+            {split_passive_ref(event.ref)[0] for event in battle_state["events"]}, {0},
+        )
+
+    def test_encode_rejects_out_of_range_refs(self):
+        with self.assertRaises(ValueError):
+            encode_events([BattleEvent(1, 0, EVENT_PASSIVE_DAMAGE, 1, False, 256)], 10, 0, 10, 0)
+
+
+def make_equipment(name, slot, stats, bonuses=None):
+    item = Item.objects.create(name=name, description="", emoji="⚔️", item_type="equipment")
+    return Equipment.objects.create(
+        item=item, slot=slot, stats=stats, attribute_bonuses=bonuses or {}, passive_skill={},
+    )
+
+
+class WeaknessTests(TestCase):
+    def test_snapshot_uses_the_weakness_to_the_attacker_style(self):
+        sword = make_equipment("Espada", "hands", {"attack": {"type": "physical", "style": "slash", "value": 4}})
+        spear = make_equipment("Lança", "hands", {"attack": {"type": "physical", "style": "pierce", "value": 4}})
+        helmet = make_equipment("Elmo", "head", {"defense": {"value": 1, "weakness": "slash"}})
+        chest = make_equipment("Peitoral", "chest", {"defense": {"value": 3, "weakness": "slash"}})
+        defender = Character.objects.create(name="Lobo", type="monster", equipped_head=helmet, equipped_chest=chest)
+        defender.refresh_combat_stats()
+
+        target = CombatantSnapshot.from_character(defender)
+        swordsman = CombatantSnapshot.from_character(Character(name="A", equipped_hands=sword))
+        spearman = CombatantSnapshot.from_character(Character(name="B", equipped_hands=spear))
+        unarmed = CombatantSnapshot.from_character(Character(name="C"))
+
+        self.assertAlmostEqual(target.weakness_against(swordsman), 0.25)
+        self.assertEqual(target.weakness_against(spearman), 0.0)
+        self.assertEqual(target.weakness_against(unarmed), 0.0)
+        self.assertEqual(CombatantSnapshot.from_dict(target.to_dict()).key(), target.key())
+
+
+class ArenaPointsTests(TestCase):
+    def setUp(self):
+        self.attacker = make_ranked("Desafiante", 1000)
+        self.defender = make_ranked("Desafiado", 1040)
+        self.ids = (self.attacker.character_id, self.defender.character_id)
+
+    def stale_reads(self, times):
+        """Faz as primeiras ``times`` leituras verem pontos antigos, como se outra luta gravasse no meio."""
+        load_points = arena._load_points
+        calls = []
+
+        def stale(queryset, character_ids):
+            points = load_points(queryset, character_ids)
+            calls.append(points)
+            if len(calls) <= times:
+                return {character_id: value - 100 for character_id, value in points.items()}
+            return points
+
+        return mock.patch.object(arena, "_load_points", side_effect=stale), calls
+
+    def points(self):
+        return dict(ArenaRanking.objects.filter(character_id__in=self.ids).values_list("character_id", "points"))
+
+    def test_conflict_is_retried_with_fresh_points(self):
+        patch, calls = self.stale_reads(1)
+        with patch:
+            gained = arena.apply_fight_result(*self.ids, attacker_won=True)
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(gained, (30, -30))  # diferença real de 40 pontos, não a lida no conflito
+        self.assertEqual(self.points(), {self.ids[0]: 1030, self.ids[1]: 1010})
+
+    def test_fallback_gains_come_from_the_locked_rows(self):
+        # toda leitura fora da trava sai velha: o ganho não pode depender dela
+        patch, calls = self.stale_reads(arena.OPTIMISTIC_ATTEMPTS + 1)
+        with patch:
+            gained = arena.apply_fight_result(*self.ids, attacker_won=False)
+
+        self.assertEqual(len(calls), arena.OPTIMISTIC_ATTEMPTS)
+        self.assertEqual(gained, (-30, 30))
+        self.assertEqual(self.points(), {self.ids[0]: 970, self.ids[1]: 1070})
+
+    def test_apply_fight_results_matches_fight_by_fight(self):
+        third = make_ranked("Terceiro", 1300)
+        fights = [
+            (self.ids[0], self.ids[1], True),
+            (third.character_id, self.ids[0], False),
+            (self.ids[1], third.character_id, True),
+        ]
+        expected = arena.apply_results({**self.points(), third.character_id: 1300}, fights)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result = arena.apply_fight_results(fights)
+
+        self.assertEqual(result, expected)
+        self.assertEqual(
+            dict(ArenaRanking.objects.filter(character_id__in=expected).values_list("character_id", "points")),
+            expected,
+        )
+        self.assertEqual(
+            {change.character_id: change.points for change in LeaderboardChange.objects.all()}, expected,
+        )
+
+    def test_missing_ranking_raises(self):
+        with self.assertRaises(ArenaRanking.DoesNotExist):
+            arena.apply_fight_results([(self.ids[0], 999_999, True)])
+
+
+def snapshot(strength, dexterity, constitution, luck=4, weapon_damage=0, armor=0):
+    attrs = {
+        "strength": strength, "dexterity": dexterity, "arcane": 1,
+        "constitution": constitution, "courage": 2, "luck": luck,
+    }
+    return CombatantSnapshot(attrs, weapon_damage=weapon_damage, armor=armor)
+
+
+class MatchupOddsTests(TestCase):
+    character = snapshot(8, 6, 6, weapon_damage=3)
+    monster = snapshot(9, 5, 7)
+
+    def test_matches_the_vectorized_simulation(self):
+        odds = matchup_odds(self.character, 60, self.monster, 70)
+        sample = simulate_snapshots(self.character, 60, self.monster, 70, battles=20000, seed=3)
+
+        self.assertAlmostEqual(odds["win"] + odds["lose"] + odds["draw"], 1.0)
+        self.assertAlmostEqual(odds["win"], sample["win_rate"], delta=0.02)
+        self.assertAlmostEqual(odds["lose"], sample["loss_rate"], delta=0.02)
+        self.assertAlmostEqual(odds["expected_turns"], sample["avg_turns"], delta=0.3)
+
+    def test_matches_the_battle_engine(self):
+        odds = matchup_odds(self.character, 60, self.monster, 70)
+        battles = 1000
+        wins = sum(
+            run_combat(
+                Combatant("Eu", self.character, 60, 0), Combatant("Lobo", self.monster, 70, 0),
+                seed=seed, mode="summary",
+            ).winner == "character"
+            for seed in range(battles)
+        )
+
+        self.assertAlmostEqual(odds["win"], wins / battles, delta=0.05)
+
+    def test_damage_floor(self):
+        # sem crítico (sorte 0) e dano bruto negativo: todo acerto causa o mínimo de 1
+        weakling = snapshot(1, 1, 1, luck=0)
+        tank = snapshot(1, 30, 40, armor=20)
+        hit = compute_hit_chance(weakling, tank) / 100
+
+        dist = damage_distribution(weakling, tank)
+
+        self.assertEqual(set(dist), {0, 1})
+        self.assertAlmostEqual(dist[1], hit)
+        self.assertAlmostEqual(dist[0], 1 - hit)
+
+    def test_zero_hp_and_zero_turns(self):
+        self.assertEqual(matchup_odds(self.character, 60, self.monster, 0)["win"], 1.0)
+        self.assertEqual(matchup_odds(self.character, 0, self.monster, 70)["lose"], 1.0)
+        self.assertEqual(
+            run_combat(Combatant("Eu", self.character, 60, 0), Combatant("Lobo", self.monster, 0, 0), seed=1).winner,
+            "character",
+        )
+
+        odds = matchup_odds(self.character, 60, self.monster, 70, turns=0)
+        self.assertEqual((odds["win"], odds["lose"], odds["draw"]), (0.0, 0.0, 1.0))
+
+
+class ReplayTests(TestCase):
+    def setUp(self):
+        sword = make_equipment("Espada", "hands", {"attack": {"type": "physical", "style": "slash", "value": 5}})
+        sword.passive_skill = {
+            "name": "Fúria",
+            "trigger": "on_attack",
+            "cost": 2,
+            "effects": [{"type": "attribute_mod", "target": "self", "payload": {"attribute": "strength", "value": 1, "duration": 2}}],
+        }
+        sword.save()
+        self.character = Character.objects.create(
+            name="Eu", type="player", strength=6, constitution=8, hp=80, mana=30, equipped_hands=sword,
+        )
+        self.monster = Character.objects.create(name="Lobo", type="monster", strength=7, constitution=7, hp=70)
+        for character in (self.character, self.monster):
+            character.refresh_combat_stats()
+            character.save()
+
+        self.result = run_battle(self.character, self.monster, seed=42)
+        self.encounter = record_encounter(self.result)
+
+    def test_replay_reproduces_winner_and_events(self):
+        # o personagem sai da luta machucado; o replay parte do hp/mana gravados
+        Character.objects.filter(pk=self.character.pk).update(hp=1, mana=0)
+        encounter = EncounterLog.objects.get(pk=self.encounter.pk)
+
+        replay = replay_encounter(encounter)
+
+        self.assertEqual(replay["winner"], encounter.winner)
+        self.assertEqual(replay["winner"], self.result["winner"])
+        _, recorded = decode_events(encounter.events)
+        self.assertEqual(decode_events(encode_events(replay["events"], **replay["initial"]))[1], recorded)
+        self.assertIn(EVENT_ATTRIBUTE_MOD, {event.kind for event in recorded})  # a passiva também é reproduzida
+
+    def test_changed_loadout_raises(self):
+        axe = make_equipment("Machado", "hands", {"attack": {"type": "physical", "style": "blunt", "value": 9}})
+        self.character.equipped_hands = axe
+        self.character.refresh_combat_stats()
+        self.character.save()
+
+        with self.assertRaises(ValueError):
+            replay_encounter(EncounterLog.objects.get(pk=self.encounter.pk))
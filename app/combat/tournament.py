@@ -0,0 +1,124 @@
+# combat/tournament.py
+"""
+Torneios de arena em lote (ver ``manage.py run_arena_tournament``).
+
+As lutas usam o núcleo do combate (``run_combat`` em modo "summary") com as
+mesmas regras de ``arena_fight``: quem desafia luta com as passivas dos seus
+equipamentos, quem é desafiado sem. Todos começam cada luta com hp/mana
+cheios e nenhuma luta altera hp/mana dos personagens.
+
+Os combatentes são enviados UMA vez para cada processo (``initializer`` do
+pool, ver combat/pool.py); cada tarefa é só ``(desafiante, desafiado, seed)``.
+Os pontos são aplicados na ordem das lutas com ``calculate_arena_points``,
+depois que todas terminam (e gravados com ``apply_fight_results``, ver combat/arena.py).
+"""
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from .adapters import combatant_from_model
+from .arena import apply_results
+from .pool import fight, init_worker
+
+
+def arena_combatants(character):
+    """Os dois ``Combatant`` de um personagem na arena, com hp/mana cheios."""
+    attacker = combatant_from_model(character)
+    defender = combatant_from_model(character, with_passives=False)
+    for combatant in (attacker, defender):
+        combatant.hp = character.max_hp
+        combatant.mana = character.max_mana
+    return attacker, defender
+
+
+def run_fights(combatants, fights, workers=None, chunksize=256):
+    """
+    Executa as lutas ``(desafiante, desafiado, seed)`` e retorna, na mesma
+    ordem, se o desafiante venceu. ``workers=1`` roda no próprio processo.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1 or len(fights) < chunksize:
+        init_worker(combatants)
+        return [fight(task) for task in fights]
+
+    # fight/init_worker vêm de combat/pool.py, que não depende do Django
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(combatants,)) as pool:
+        return list(pool.map(fight, fights, chunksize=chunksize))
+
+
+def round_robin_pairings(ids):
+    """Todos contra todos, uma luta por par; o desafiante alterna para equilibrar."""
+    ids = sorted(ids)
+    pairings = []
+    for i, first in enumerate(ids):
+        for j in range(i + 1, len(ids)):
+            second = ids[j]
+            pairings.append((first, second) if (i + j) % 2 else (second, first))
+    return pairings
+
+
+def swiss_pairings(points, played):
+    """
+    Uma rodada do sistema suíço: ordena por pontos e junta cada jogador com o
+    próximo da tabela que ele ainda não enfrentou. Com número ímpar, o último
+    da tabela fica de fora na rodada.
+    """
+    standings = sorted(points, key=lambda pk: (-points[pk], pk))
+    pairings = []
+    waiting = list(standings)
+
+    while len(waiting) > 1:
+        first = waiting.pop(0)
+        index = next(
+            (i for i, other in enumerate(waiting) if frozenset((first, other)) not in played),
+            0,
+        )
+        second = waiting.pop(index)
+        pairings.append((first, second))
+
+    return pairings
+
+
+def _with_seeds(pairings, rng):
+    return [(attacker_id, defender_id, rng.getrandbits(63)) for attacker_id, defender_id in pairings]
+
+
+def _fight_results(pairings, results):
+    return [(attacker_id, defender_id, won) for (attacker_id, defender_id), won in zip(pairings, results)]
+
+
+def run_tournament(combatants, points, system="round-robin", rounds=None, seed=None, workers=None):
+    """
+    Executa o torneio e retorna ``(pontos finais, lutas)``, com as lutas no
+    formato de ``apply_fight_results``. ``combatants`` vem de
+    ``arena_combatants``; ``points`` não é alterado.
+    """
+    rng = random.Random(seed)
+    points = dict(points)
+
+    if system == "round-robin":
+        pairings = round_robin_pairings(points)
+        fights = _fight_results(pairings, run_fights(combatants, _with_seeds(pairings, rng), workers))
+        apply_results(points, fights)
+        return points, fights
+
+    if system != "swiss":
+        raise ValueError(f"Sistema de torneio inválido: {system}")
+
+    if rounds is None:
+        rounds = max(1, (len(points) - 1).bit_length())
+
+    played = set()
+    fights = []
+    for _ in range(rounds):
+        pairings = swiss_pairings(points, played)
+        if not pairings:
+            break
+        round_fights = _fight_results(pairings, run_fights(combatants, _with_seeds(pairings, rng), workers))
+        apply_results(points, round_fights)
+        played.update(frozenset(pair) for pair in pairings)
+        fights += round_fights
+
+    return points, fights
@@ -3,24 +3,28 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.http import HttpResponseBadRequest
 from django.db import transaction
-from combat.engine import run_battle
+from django.db.models import F
+from combat.adapters import run_battle, apply_battle_result
 from items.models import EquipmentSlot
-from character.models import Character
+from character.models import Character, loadout_related
 from tasks.models import HuntMonster
 from items.models import InventoryItem
+from .arena import apply_fight_result, defender_combatant
+from .leaderboard import leaderboard
+from .matchmaking import nearest_opponents
 from .models import ArenaRanking
-from .utils import calculate_arena_points
+from .replay import record_encounter
 import random
 
 
 @login_required
 def hunt(request, monster_id):
     try:
-        character = request.user.character
+        character = Character.objects.with_loadout().get(user=request.user)
     except:
         return HttpResponseBadRequest("Usuário não tem personagem.")
 
-    hunt_monster = HuntMonster.objects.get(id=monster_id)
+    hunt_monster = HuntMonster.objects.select_related(*loadout_related("monster")).get(id=monster_id)
     monster = hunt_monster.monster
 
     result = run_battle(character, monster)
@@ -28,11 +32,17 @@ def hunt(request, monster_id):
     xp = getattr(hunt_monster, "xp_drop", 0)
     gold = getattr(hunt_monster, "gold_drop", 0)
 
+    # hp/mana da batalha + XP + ouro em um único UPDATE
     with transaction.atomic():
-        character.hp = max(0, int(result["char_state"]["hp"]))
-        leveled = character.add_experience(xp)
+        fields = apply_battle_result(character, result["battle"])
+        leveled = character.add_experience(xp, save=False)
+        fields += Character.EXPERIENCE_FIELDS
+        Character.objects.filter(pk=character.pk).update(
+            gold=F("gold") + gold,
+            **{field: getattr(character, field) for field in fields},
+        )
         character.gold += gold
-        character.save()
+        record_encounter(result)
     
     level_up_text = ""
     if leveled:
@@ -73,16 +83,12 @@ def arena(request):
     player = request.user.character
     ranking, created = ArenaRanking.objects.get_or_create(character=player)
 
-    # Todos players com ranking
-    all_players = ArenaRanking.objects.exclude(character=player).order_by("points")
+    # quem está logo acima / abaixo no ranking
+    challenges = list(nearest_opponents(ranking, k=4))
 
-    # pegar quem está logo acima / abaixo
-    above = list(all_players.filter(points__gt=ranking.points-1).order_by("points")[:4])
-    below = list(all_players.filter(points__lt=ranking.points+1).order_by("-points")[:4])
-    challenges = list(set(above + below))
-
-    # top 5 geral
-    top5 = ArenaRanking.objects.order_by("-points")[:5]
+    # top 5 geral e posição do jogador, direto do leaderboard em memória
+    top5 = leaderboard.top(5)
+    ranking.position = leaderboard.rank(player.pk)
 
     context = {
         "player": player,
@@ -95,28 +101,21 @@ def arena(request):
 
 @login_required
 def arena_fight(request, target_id):
-    player = request.user.character
-    opponent = get_object_or_404(Character, id=target_id)
+    player = Character.objects.with_loadout().get(user=request.user)
+    opponent_ranking = get_object_or_404(
+        ArenaRanking.objects.select_related("character"), character_id=target_id
+    )
+    opponent = opponent_ranking.character
 
     if opponent.type != "player":
         raise HttpResponseBadRequest("Você só pode enfrentar jogadores.")
     
-    result = run_battle(player, opponent)
+    result = run_battle(player, opponent, defender=defender_combatant(opponent_ranking))
     winner = result["winner"]
+    player.save(update_fields=apply_battle_result(player, result["battle"]))
     
-    arena_player = ArenaRanking.objects.get(character=player)
-    arena_opponent = ArenaRanking.objects.get(character=opponent)
-
-    gained_player, gained_opponent = calculate_arena_points(
-        arena_player.points,
-        arena_opponent.points,
-        attacker_won=(winner == "character")
-    )
-
-    # atualiza pontos
-    arena_player.points += gained_player
-    arena_opponent.points += gained_opponent
-    arena_player.save()
-    arena_opponent.save()
+    # pontos dos dois num único UPDATE condicional (ver combat/arena.py)
+    apply_fight_result(player.pk, opponent.pk, attacker_won=(winner == "character"))
+    record_encounter(result)
 
     return render(request, "combat/hunt.html", result)
\ No newline at end of file
@@ -3,6 +3,7 @@ from .models import InventoryItem, Item, ItemType, MarketListing, StoreItem
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from character.models import Character
+from character.signals import combat_stats_changed
 from django.db import transaction
 from django.http import JsonResponse
 import json
@@ -26,7 +27,7 @@ def equip_item(request):
 
     item_id = data.get("item_id")
     action = data.get("action")
-    character = request.user.character
+    character = Character.objects.with_loadout().get(user=request.user)
 
     inv_item = None
     item = None
@@ -74,7 +75,9 @@ def equip_item(request):
 
         # equipa o novo
         setattr(character, slot, equipment)
+        character.refresh_combat_stats()
         character.save()
+        combat_stats_changed.send(sender=Character, instance=character)
 
         # reduz inventário
         inv_item.quantity -= 1
@@ -101,7 +104,9 @@ def equip_item(request):
 
         # remove do slot
         setattr(character, slot, None)
+        character.refresh_combat_stats()
         character.save()
+        combat_stats_changed.send(sender=Character, instance=character)
 
         inv_item, created = InventoryItem.objects.get_or_create(
             character=character,
@@ -119,7 +124,7 @@ def equip_item(request):
 
 @login_required
 def inventory_view(request):
-    character = request.user.character  # porque você fez OneToOne com User
+    character = Character.objects.with_loadout().get(user=request.user)
     inventory = InventoryItem.objects.filter(character=character).select_related("item")
 
     # separa por tipo
@@ -0,0 +1,6 @@
+# tasks/config.py
+from character.config import ConfigCache
+
+from .models import TasksConfig
+
+tasks_config = ConfigCache(TasksConfig)
@@ -2,6 +2,8 @@ from django.contrib.auth.models import User
 from django.db import models
 from django.utils import timezone
 
+from character.progression import level_up
+
 
 class TasksConfig(models.Model):
     # Configurações de treino
@@ -37,24 +39,26 @@ class Profession(models.Model):
     exp = models.IntegerField(default=0)
     max_exp = models.IntegerField(default=100)
 
-    def add_experience(self, amount):
+    # campos alterados por add_experience
+    EXPERIENCE_FIELDS = ("exp", "level", "max_exp")
+
+    def add_experience(self, amount, save=True):
         """
         Adiciona XP e aplica lógica de subir de nível.
         growth_rate = fator de crescimento (ex: 1.5 = 50% mais difícil a cada nível)
+        save=False deixa a gravação para quem chamou (ver EXPERIENCE_FIELDS).
         """
         self.exp += amount
 
-        leveled_up = False
-        # loop para tratar casos em que ganha XP suficiente para subir vários níveis
-        while self.exp >= self.max_exp:
-            self.exp -= self.max_exp
-            self.level += 1
-            # recalcula xp para próximo nível
-            self.max_exp = int(self.max_exp * self.profession_type.level_growth_rate)
-            leveled_up = True
-
-        self.save()
-        return leveled_up
+        # pode subir vários níveis de uma vez (ver character/progression.py)
+        levels, self.exp, self.max_exp = level_up(
+            self.exp, self.max_exp, self.profession_type.level_growth_rate
+        )
+        self.level += levels
+
+        if save:
+            self.save()
+        return levels > 0
 
 class Job(models.Model):
     profession_type = models.ForeignKey(
@@ -4,11 +4,11 @@ import random
 from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import UserCreationForm
+from django.db.models import Prefetch
 from django.shortcuts import render, redirect, get_object_or_404
 from django.utils import timezone
 
 from .models import (
-    TasksConfig,
     Job,
     CharacterJob,
     Profession,
@@ -16,8 +16,11 @@ from .models import (
     CharacterHunt,
     HuntMonster
 )
+from .config import tasks_config
 
-from character.models import Character
+from character.models import Character, loadout_related
+from combat.battle import CombatantSnapshot
+from combat.matchups import get_matchup_odds
 from items.models import InventoryItem
 
 from datetime import timedelta
@@ -42,7 +45,7 @@ def create_character(request):
 @login_required
 def dashboard(request):
     try:
-        character = Character.objects.get(user=request.user)
+        character = Character.objects.with_loadout().get(user=request.user)
     except Character.DoesNotExist:
         return redirect("create_character")  # redireciona para criar personagem
 
@@ -81,7 +84,7 @@ def signup(request):
 @login_required
 def training(request):
     """Página que mostra info do treino antes de começar"""
-    config = TasksConfig.objects.first()
+    config = tasks_config.get()
     character = Character.objects.get(user=request.user)
 
     # pega o alerta e remove da sessão
@@ -123,7 +126,7 @@ def start_training(request):
 @login_required
 def end_training(request):
     character = Character.objects.get(user=request.user)
-    config = TasksConfig.objects.first()
+    config = tasks_config.get()
 
     if character.training_start:
         # calcula tempo de treino em minutos
@@ -152,7 +155,7 @@ def end_training(request):
 @login_required
 def resting(request):
     """Página que mostra info do treino antes de começar"""
-    config = TasksConfig.objects.first()
+    config = tasks_config.get()
     character = Character.objects.get(user=request.user)
 
     # pega o alerta e remove da sessão
@@ -194,7 +197,7 @@ def start_resting(request):
 @login_required
 def end_resting(request):
     character = Character.objects.get(user=request.user)
-    config = TasksConfig.objects.first()
+    config = tasks_config.get()
 
     if character.resting_start:
         # calcula tempo de descanso em minutos
@@ -376,8 +379,17 @@ def end_job(request, job_id):
 
 @login_required
 def hunts_list(request):
-    character = get_object_or_404(Character, user=request.user)
-    hunts = Hunt.objects.all()
+    character = get_object_or_404(Character.objects.with_loadout(), user=request.user)
+    hunts = Hunt.objects.prefetch_related(
+        Prefetch("monsters", queryset=HuntMonster.objects.select_related(*loadout_related("monster")))
+    )
+
+    # chance de vitória exata (sem passivas) contra cada monstro
+    char_snapshot = CombatantSnapshot.from_character(character)
+    for hunt in hunts:
+        for hm in hunt.monsters.all():
+            odds = get_matchup_odds(character, hm, char_snapshot)
+            hm.win_chance = round(odds["win"] * 100)
 
     return render(request, "game/hunts.html", {
         "character": character,